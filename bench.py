@@ -0,0 +1,390 @@
+# Copyright © 2025 zinarr1
+#
+# Headless benchmarks for the crosshairZ hot paths.
+#
+#   python bench.py                                  run and print results
+#   python bench.py --out results.json               also write them as JSON
+#   python bench.py --save-baseline                  store results as the baseline
+#   python bench.py --baseline bench_baseline.json   fail on regressions
+#   python bench.py --tint                           tint_image against the old per-pixel loop
+#   python bench.py --pyramid                        pyramid scaling against direct scaling
+#
+# Runs under QT_QPA_PLATFORM=offscreen. The Windows-only click-through call,
+# the global mouse/keyboard hooks and the tray icon are stubbed out.
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import crosshairZ
+from PyQt5 import QtWidgets, QtGui, QtCore
+
+BASELINE_FILE = "bench_baseline.json"
+PNG_SIZES = (64, 256, 1024, 2048)
+PROFILE_COUNT = 500
+
+
+def stub_platform():
+    crosshairZ.Crosshair.make_clickthrough = lambda self: None
+    crosshairZ.Crosshair.start_hotkeys = lambda self: None
+    crosshairZ.Crosshair.create_tray_icon = lambda self: None
+    crosshairZ.Crosshair.start_mouse_listener = lambda self: None
+
+
+def measure(fn, repeat=7, number=1, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return {
+        "median_ms": statistics.median(times) * 1000,
+        "min_ms": min(times) * 1000,
+        "runs": repeat * number,
+    }
+
+
+def tint_per_pixel(image, color):
+    # The old per-pixel overlay loop, the reference tint_image is checked against
+    image = image.convertToFormat(QtGui.QImage.Format_ARGB32)
+    for y in range(image.height()):
+        for x in range(image.width()):
+            alpha = image.pixelColor(x, y).alpha()
+            if alpha > 0:
+                image.setPixelColor(x, y, QtGui.QColor(color.red(), color.green(), color.blue(), alpha))
+    return image
+
+
+def source_image(size):
+    image = QtGui.QImage(size, size, QtGui.QImage.Format_ARGB32)
+    image.fill(QtCore.Qt.transparent)
+    painter = QtGui.QPainter(image)
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255, 200), max(1, size // 16)))
+    painter.drawEllipse(size // 8, size // 8, size * 3 // 4, size * 3 // 4)
+    painter.drawLine(size // 2, 0, size // 2, size)
+    painter.drawLine(0, size // 2, size, size // 2)
+    painter.end()
+    return image
+
+
+def bench_tint(sizes=(64, 256, 1024, 4096), repeat=5):
+    # Old loop is timed on at most ~64k pixels and scaled to the full image
+    color = QtGui.QColor("#FF0000")
+    results = []
+    for size in sizes:
+        image = source_image(size)
+        rows = max(1, min(size, 65536 // size))
+        band = image.copy(0, 0, size, rows)
+        start = time.perf_counter()
+        expected = tint_per_pixel(band, color)
+        legacy = (time.perf_counter() - start) * size / rows
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            tinted = crosshairZ.tint_image(image, color)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        premultiplied = QtGui.QImage.Format_ARGB32_Premultiplied
+        same = (tinted.copy(0, 0, size, rows).convertToFormat(premultiplied)
+                == expected.convertToFormat(premultiplied))
+        results.append({
+            "size": size,
+            "legacy_ms": legacy * 1000,
+            "legacy_extrapolated": rows < size,
+            "tint_ms": best * 1000,
+            "speedup": legacy / best if best else float("inf"),
+            "identical": same,
+        })
+    return results
+
+
+def print_bench_tint(results):
+    backend = "numpy" if crosshairZ.load_numpy() is not None else "memoryview"
+    print(f"tint_image backend: {backend}")
+    print(f"{'size':>6} {'per-pixel ms':>14} {'tint ms':>10} {'speedup':>9}  identical")
+    for r in results:
+        legacy = f"{r['legacy_ms']:.1f}{'*' if r['legacy_extrapolated'] else ''}"
+        print(f"{r['size']:>6} {legacy:>14} {r['tint_ms']:>10.2f} {r['speedup']:>8.0f}x  {r['identical']}")
+    if any(r["legacy_extrapolated"] for r in results):
+        print("* extrapolated from a band of rows")
+
+
+def image_difference(a, b):
+    # Mean and max absolute difference per premultiplied channel
+    premultiplied = QtGui.QImage.Format_ARGB32_Premultiplied
+    a = a.convertToFormat(premultiplied)
+    b = b.convertToFormat(premultiplied)
+    data_a = a.constBits().asstring(a.bytesPerLine() * a.height())
+    data_b = b.constBits().asstring(b.bytesPerLine() * b.height())
+    np = crosshairZ.load_numpy()
+    if np is not None:
+        diff = np.abs(np.frombuffer(data_a, np.uint8).astype(np.int16) - np.frombuffer(data_b, np.uint8))
+        return float(diff.mean()), int(diff.max())
+    diff = [abs(x - y) for x, y in zip(data_a, data_b)]
+    return sum(diff) / len(diff), max(diff)
+
+
+def bench_pyramid(sources=(256, 1024, 4096), sizes=(10, 40, 120, 400), repeat=5):
+    color = QtGui.QColor("#FF0000")
+    results = []
+    for source_size in sources:
+        prepared = crosshairZ.prepare_source_image(source_image(source_size), color, True)
+        start = time.perf_counter()
+        levels = crosshairZ.build_pyramid(prepared)
+        build = time.perf_counter() - start
+        for size in sizes:
+            direct_best = pyramid_best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                direct = prepared.scaled(size, size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+                elapsed = time.perf_counter() - start
+                direct_best = elapsed if direct_best is None else min(direct_best, elapsed)
+                start = time.perf_counter()
+                scaled = crosshairZ.scale_from_pyramid(levels, size)
+                elapsed = time.perf_counter() - start
+                pyramid_best = elapsed if pyramid_best is None else min(pyramid_best, elapsed)
+            mean_error, max_error = image_difference(direct, scaled)
+            results.append({
+                "source": source_size, "size": size, "build_ms": build * 1000,
+                "direct_ms": direct_best * 1000, "pyramid_ms": pyramid_best * 1000,
+                "mean_error": mean_error, "max_error": max_error,
+            })
+    return results
+
+
+def print_bench_pyramid(results):
+    print(f"{'source':>7} {'size':>5} {'direct ms':>10} {'pyramid ms':>11} {'mean err':>9} {'max err':>8}")
+    for r in results:
+        print(f"{r['source']:>7} {r['size']:>5} {r['direct_ms']:>10.3f} {r['pyramid_ms']:>11.3f} "
+              f"{r['mean_error']:>9.3f} {r['max_error']:>8}")
+    for source in sorted({r["source"] for r in results}):
+        build = next(r["build_ms"] for r in results if r["source"] == source)
+        print(f"pyramid build for {source} px source: {build:.2f} ms (once per PNG/color)")
+
+
+def write_pngs():
+    paths = {}
+    for size in PNG_SIZES:
+        path = f"bench_{size}.png"
+        source_image(size).save(path)
+        paths[size] = path
+    return paths
+
+
+def write_profiles(count, png):
+    profiles = {"Default": crosshairZ.load_settings()}
+    for i in range(count):
+        profiles[f"Profile {i}"] = {
+            **profiles["Default"],
+            "profile": f"Profile {i}",
+            "size": 20 + i % 200,
+            "color": f"#{(i * 2654435761) & 0xFFFFFF:06x}",
+            "crosshair": png,
+        }
+    with open(crosshairZ.PROFILES_FILE, "w") as f:
+        json.dump(profiles, f, indent=4)
+
+
+def bench_render(w, pngs, results, repeat):
+    def load():
+        # Request to swap-in, including the time on the render pool
+        w.load_crosshair()
+        w.wait_for_render()
+
+    for size, path in pngs.items():
+        for overlay in (False, True):
+            for opacity in (1.0, 0.5):
+                w.settings.update({"crosshair": path, "size": 40, "use_color_overlay": overlay, "opacity": opacity})
+                w.refresh_view()
+                name = f"load_crosshair/{size}px/{'overlay' if overlay else 'plain'}/opacity{opacity}"
+                results[name + "/cold"] = measure(load, repeat, setup=crosshairZ.render_cache.clear)
+                results[name + "/warm"] = measure(load, repeat, number=20)
+    for size in (40, 400):
+        color = QtGui.QColor("#FF0000")
+        results[f"draw_default_crosshair/{size}px"] = measure(
+            lambda: w.draw_default_crosshair(size, color), repeat, number=20)
+
+
+def bench_follow(w, results, repeat):
+    for follow in (False, True):
+        w.apply_settings({"follow_mouse": follow}, persist=False)
+        name = "follow_mouse/" + ("follow" if follow else "fixed")
+        results[name] = measure(w.follow_mouse, repeat, number=200)
+    w.apply_settings({"follow_mouse": False}, persist=False)
+
+
+def bench_overlays(w, results, repeat):
+    w.apply_settings({"follow_mouse": True}, persist=False)
+    for extra in (0, 3):
+        w.apply_settings({"overlays": [{"x": 10 * (i + 1)} for i in range(extra)]}, persist=False)
+        results[f"follow_all/{extra + 1}_windows"] = measure(w.follow_all, repeat, number=200)
+    w.apply_settings({"overlays": [], "follow_mouse": False}, persist=False)
+
+
+def bench_live_update(w, pngs, results, repeat):
+    dialog = crosshairZ.SettingsDialog(w.settings, w)
+    toggles = {
+        "size": lambda i: dialog.sizeSlider.setValue(40 + i % 2),
+        "step": lambda i: dialog.stepSpinBox.setValue(0.1 + i % 2 * 0.1),
+        "hide_on_right_click": lambda i: dialog.hideRightClickCheck.setChecked(bool(i % 2)),
+        "use_color_overlay": lambda i: dialog.useColorOverlayCheck.setChecked(bool(i % 2)),
+        "opacity": lambda i: dialog.opacitySlider.setValue(90 + i % 2),
+        "timer_interval": lambda i: dialog.timerSpinBox.setValue(10 + i % 2),
+        "follow_mouse": lambda i: dialog.followMouseCheck.setChecked(bool(i % 2)),
+    }
+
+    def set_color(i):
+        dialog.colorName = "#FF0000" if i % 2 else "#00FF00"
+        dialog.live_update()
+
+    def set_png(i):
+        dialog.pngPath = pngs[PNG_SIZES[1]] if i % 2 else pngs[PNG_SIZES[0]]
+        dialog.live_update()
+
+    toggles["color"] = set_color
+    toggles["crosshair"] = set_png
+    for field, toggle in toggles.items():
+        counter = iter(range(10 ** 9))
+
+        def update():
+            # Re-renders finish in the pool; time them until they are swapped in
+            toggle(next(counter))
+            w.wait_for_render()
+        results[f"live_update/{field}"] = measure(update, repeat, number=10)
+    dialog.followMouseCheck.setChecked(False)
+    dialog.accept()
+
+
+def bench_profiles(w, pngs, results, repeat):
+    write_profiles(PROFILE_COUNT, pngs[PNG_SIZES[1]])
+    crosshairZ.profile_store.close()
+    if os.path.exists(crosshairZ.PROFILES_DB):
+        os.remove(crosshairZ.PROFILES_DB)
+    results[f"profile_store/import/{PROFILE_COUNT}"] = measure(crosshairZ.profile_store.names, repeat=1)
+    dialogs = []
+    results[f"settings_dialog/open/{PROFILE_COUNT}"] = measure(
+        lambda: dialogs.append(crosshairZ.SettingsDialog(w.settings, w)), repeat)
+    dialog = dialogs[-1]
+    names = [f"Profile {i}" for i in range(PROFILE_COUNT)]
+    counter = iter(range(10 ** 9))
+    results[f"change_profile/{PROFILE_COUNT}"] = measure(
+        lambda: dialog.change_profile(names[next(counter) % len(names)]), repeat, number=5)
+    QtCore.QThreadPool.globalInstance().waitForDone()
+    dialog.accept()
+    results[f"load_profiles/{PROFILE_COUNT}"] = measure(crosshairZ.load_profiles, repeat)
+
+
+def bench_persistence(w, results, repeat):
+    results["save_settings/call"] = measure(lambda: crosshairZ.save_settings(w.settings), repeat, number=50)
+    results["save_settings/flush"] = measure(
+        crosshairZ.json_store.flush, repeat, setup=lambda: crosshairZ.save_settings(w.settings))
+    results["load_settings"] = measure(crosshairZ.load_settings, repeat, number=20)
+
+
+def run(repeat):
+    stub_platform()
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            pngs = write_pngs()
+            w = crosshairZ.Crosshair()
+            w.show()
+            bench_render(w, pngs, results, repeat)
+            bench_follow(w, results, repeat)
+            bench_overlays(w, results, repeat)
+            bench_live_update(w, pngs, results, repeat)
+            bench_profiles(w, pngs, results, repeat)
+            bench_persistence(w, results, repeat)
+            crosshairZ.json_store.flush()
+            crosshairZ.profile_store.close()
+        finally:
+            os.chdir(cwd)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "qt": QtCore.QT_VERSION_STR,
+            "platform": platform.platform(),
+            "numpy": crosshairZ.load_numpy() is not None,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold, min_delta_ms):
+    # A case regresses when its best time is both threshold slower and
+    # min_delta_ms slower; the best run is the least affected by noise
+    regressions = []
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        new_ms, old_ms = result["min_ms"], old["min_ms"]
+        if new_ms > old_ms * (1 + threshold) and new_ms - old_ms > min_delta_ms:
+            regressions.append((name, old_ms, new_ms))
+    return regressions
+
+
+def print_results(report):
+    width = max(len(name) for name in report["results"])
+    for name, result in report["results"].items():
+        print(f"{name:<{width}}  {result['median_ms']:>10.3f} ms  (min {result['min_ms']:.3f})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless crosshairZ benchmarks")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write results to {BASELINE_FILE}")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="ignore slowdowns smaller than this")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--tint", action="store_true", help="only compare tint_image with the per-pixel loop")
+    parser.add_argument("--pyramid", action="store_true", help="only compare pyramid and direct scaling")
+    args = parser.parse_args(argv)
+
+    if args.tint or args.pyramid:
+        if args.tint:
+            print_bench_tint(bench_tint())
+        if args.pyramid:
+            print_bench_pyramid(bench_pyramid())
+        return 0
+
+    report = run(args.repeat)
+    print_results(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=4)
+    if args.save_baseline:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(report, f, indent=4)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+        for name, old_ms, new_ms in regressions:
+            print(f"REGRESSION {name}: {old_ms:.3f} ms -> {new_ms:.3f} ms")
+        if regressions:
+            return 1
+        print("no regressions against", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
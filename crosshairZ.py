@@ -1,71 +1,1578 @@
 # Copyright © 2025 zinarr1
 
+import time
+MODULE_STARTED = time.perf_counter()  # Start of the "imports" phase of --profile-startup
 import sys
 import json
 import os
 import threading
-import keyboard
-import ctypes
-import time
+import copy
+import atexit
+import math
+from collections import OrderedDict, deque
 from PyQt5 import QtWidgets, QtGui, QtCore
-from datetime import time as datetime_time
-from pynput.mouse import Listener
-from pynput import mouse
+# keyboard and pynput are imported when the hooks start, after the first
+# paint; sqlite3, csv, ctypes and numpy where they are used
+
+_numpy = False  # Not imported yet, see load_numpy
+
+def load_numpy():
+    # numpy is optional (tint_image has a pure Python path) and the largest
+    # import, so it is imported on first use; None when it is not installed
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+def percentile(sorted_values, q):
+    # Nearest-rank q quantile (0..1) of an ascending list, 0.0 when it is empty
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
 
 SETTINGS_FILE = "settings.json"
 PROFILES_FILE = "profiles.json"  # For profile support
+PROFILES_DB = "profiles.db"  # Indexed profile store, imported from PROFILES_FILE once
+LAST_RENDER_FILE = "last_render.png"  # Pixmap shown at startup before anything is rendered
+CONTROL_SERVER_NAME = "crosshairZ-control"  # Local socket of the control API (see ControlServer)
+
+# Settings fields grouped by the update stage they need (see Crosshair.apply_settings)
+RENDER_FIELDS = frozenset(("crosshair", "size", "color", "opacity", "use_color_overlay", "shape", "vector",
+                           "drawing", "animation"))
+POSITION_FIELDS = frozenset(("x", "y", "monitor_index", "follow_mouse"))
+TIMER_FIELDS = frozenset(("timer_interval", "follow_mouse", "follow_events"))
+UPDATE_STAGES = ("render", "reposition", "timer", "persist")
+# Settings of the app itself: not saved in profiles and kept when one is loaded
+APP_FIELDS = frozenset(("hotkeys", "overlays", "telemetry", "render_cache_mb", "prewarm_profiles",
+                        "follow_events", "control_server"))
+
+# Parameters of the procedural crosshair (shape "vector"), in logical pixels
+DEFAULT_VECTOR = {
+    "dot": False,
+    "arm_length": 6,
+    "gap": 3,
+    "thickness": 2,
+    "outline": 1,
+    "t_shape": False,
+    "circle": 0,  # Ring radius, 0 = no ring
+}
+
+# Hand-drawn crosshair (shape "drawn"): strokes on a square grid of "grid"
+# pixels, scaled to the crosshair size. A stroke is {"points": [x0, y0, x1,
+# y1, ...], "width": pen width, "mirror": one of MIRROR_MODES}, in grid pixels.
+DEFAULT_DRAWING = {"grid": 40, "strokes": []}
+MIRROR_MODES = ("none", "x", "y", "xy")  # x mirrors left/right, y top/bottom, xy both
+
+# Procedural animations and their frame counts. "file" plays GIF/APNG frames.
+ANIMATION_FRAMES = {"pulse": 30, "spin": 36}
+
+# Sub-pixel placement: fractional offsets are drawn with pixmaps shifted in
+# steps of 1 / SUBPIXEL_PHASES px
+SUBPIXEL_PHASES = 4
+
+# Hotkey actions and their default keys (keyboard module key names, "" = unbound)
+DEFAULT_HOTKEYS = {
+    "open_settings": "f2",
+    "toggle_visibility": "f3",
+    "profile_next": "",
+    "profile_prev": "",
+    "nudge_left": "",
+    "nudge_right": "",
+    "nudge_up": "",
+    "nudge_down": "",
+}
+
+class JsonStore:
+    # Write-behind JSON persistence. save() only records a snapshot; a
+    # background thread writes it once the file has been quiet for `delay`
+    # seconds, so bursts of saves collapse into one atomic write.
+    def __init__(self, delay=0.5):
+        self.delay = delay
+        self.pending = {}  # path -> (snapshot, deadline)
+        self.lock = threading.Condition()
+        self.io_lock = threading.Lock()
+        self.thread = None
+        self.writes = 0
+        self.writes_avoided = 0
+
+    def load(self, path):
+        # Holding io_lock means a snapshot is either still pending or on disk
+        with self.io_lock:
+            with self.lock:
+                if path in self.pending:
+                    return copy.deepcopy(self.pending[path][0])
+            if not os.path.exists(path):
+                return None
+            with open(path, "r") as f:
+                return json.load(f)
+
+    def save(self, path, data):
+        snapshot = copy.deepcopy(data)
+        with self.lock:
+            if path in self.pending:
+                self.writes_avoided += 1
+            self.pending[path] = (snapshot, time.monotonic() + self.delay)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+            self.lock.notify()
+
+    def flush(self):
+        with self.io_lock:
+            with self.lock:
+                ready = self._take(all_paths=True)
+            for path, data in ready:
+                self._write(path, data)
+
+    def _take(self, all_paths=False):
+        now = time.monotonic()
+        ready = [(path, data) for path, (data, deadline) in self.pending.items()
+                 if all_paths or deadline <= now]
+        for path, _ in ready:
+            del self.pending[path]
+        return ready
+
+    def _next_timeout(self):
+        if not self.pending:
+            return None
+        due = min(deadline for _, deadline in self.pending.values())
+        return max(0.0, due - time.monotonic())
+
+    def _run(self):
+        while True:
+            with self.lock:
+                while self._next_timeout() != 0.0:
+                    self.lock.wait(self._next_timeout())
+            with self.io_lock:
+                with self.lock:
+                    ready = self._take()
+                for path, data in ready:
+                    self._write(path, data)
+
+    def _write(self, path, data):
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self.writes += 1
+        except OSError as e:
+            print("save error:", path, e)
+
+json_store = JsonStore()
+atexit.register(json_store.flush)
+
+def _clamped(kind, low, high):
+    def coerce(value):
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise TypeError(value)
+        number = float(value)
+        if math.isnan(number):
+            raise ValueError(value)  # max(low, nan) would quietly make it low
+        return kind(min(high, max(low, number)))  # Clamped first: int() fails on inf
+    coerce.range = (low, high)  # Also the range of the setting's widget
+    return coerce
+
+def _flag(value):
+    if not isinstance(value, (bool, int)):
+        raise TypeError(value)
+    return bool(value)
+
+def _text(value):
+    if not isinstance(value, str):
+        raise TypeError(value)
+    return value
+
+def _color(value):
+    if not isinstance(value, str) or not QtGui.QColor.isValidColor(value):
+        raise ValueError(value)
+    return value
+
+def _choice(*options):
+    def coerce(value):
+        if value not in options:
+            raise ValueError(value)
+        return value
+    return coerce
+
+def _like(default):
+    # Coercer for a nested value: the type of its default
+    if isinstance(default, bool):
+        return _flag
+    if isinstance(default, (int, float)):
+        return _clamped(type(default), 0, 1000)
+    if isinstance(default, str):
+        return _text
+    return _list
+
+def _merged(defaults, fields=None):
+    # A dict with the keys of defaults. Each value is checked by fields[key]
+    # or against its default's type; an invalid one falls back to the default.
+    fields = fields or {}
+    def coerce(value):
+        if not isinstance(value, dict):
+            raise TypeError(value)
+        merged = copy.deepcopy(defaults)
+        for key, default in defaults.items():
+            if key in value:
+                try:
+                    merged[key] = fields.get(key, _like(default))(value[key])
+                except (TypeError, ValueError):
+                    print("invalid setting:", key, repr(value[key]))
+        return merged
+    return coerce
+
+def _list(value):
+    if not isinstance(value, list):
+        raise TypeError(value)
+    return value
+
+# Numeric parameters of the vector crosshair and their ranges
+VECTOR_FIELDS = {
+    "arm_length": _clamped(int, 0, 100),
+    "gap": _clamped(int, 0, 50),
+    "thickness": _clamped(int, 1, 20),
+    "outline": _clamped(int, 0, 5),
+    "circle": _clamped(int, 0, 100),
+}
+
+def _strokes(value):
+    # Strokes of a drawing (see DEFAULT_DRAWING); invalid strokes are dropped
+    point = _clamped(float, -10000, 10000)
+    strokes = []
+    for stroke in _list(value):
+        try:
+            strokes.append({
+                "points": [point(v) for v in _list(stroke["points"])],
+                "width": _clamped(float, 0.1, 100)(stroke.get("width", 1)),
+                "mirror": _choice(*MIRROR_MODES)(stroke.get("mirror", "none")),
+            })
+        except (TypeError, ValueError, KeyError, AttributeError):
+            print("invalid stroke:", repr(stroke))
+    return strokes
+
+def _overlays(value):
+    # Extra overlay specs (see overlay_settings): dicts of setting overrides.
+    # Other entries and invalid overrides are dropped.
+    specs = []
+    for spec in _list(value):
+        if not isinstance(spec, dict):
+            print("invalid overlay:", repr(spec))
+            continue
+        spec = {key: check_setting(key, value, None) for key, value in spec.items() if key != "overlays"}
+        specs.append({key: value for key, value in spec.items() if value is not None})
+    return specs
+
+# The one definition of every setting: name -> (default, coerce). coerce
+# returns the normalized value or raises TypeError/ValueError.
+SETTINGS_SCHEMA = {
+    "size": (40, _clamped(int, 1, 4096)),
+    "crosshair": ("crosshair.png", _text),
+    "x": (0, _clamped(float, -10000, 10000)),  # Offsets may be fractional (sub-pixel)
+    "y": (0, _clamped(float, -10000, 10000)),
+    "step": (0.1, _clamped(float, 0.01, 100)),  # Arrow key / nudge step
+    "hide_on_right_click": (True, _flag),
+    "right_click_mode": ("hold", _choice("hold", "toggle")),
+    "hide_delay_ms": (0, _clamped(int, 0, 10000)),  # Right click to hide delay
+    "profile": ("Default", _text),
+    "color": ("#FF0000", _color),  # Default red
+    "opacity": (1.0, _clamped(float, 0.0, 1.0)),  # Default fully opaque
+    "use_color_overlay": (True, _flag),
+    "monitor_index": (0, _clamped(int, 0, 64)),  # Default to first monitor
+    "follow_mouse": (False, _flag),  # Default to not follow mouse
+    "timer_interval": (10, _clamped(int, 1, 1000)),  # Default timer interval
+    "predict_ms": (0, _clamped(int, 0, 100)),  # Follow mode lead time, 0 = off
+    "follow_events": (True, _flag),  # Follow mouse move events, no polling
+    "static_overlay": (True, _flag),  # Window mask, repaint only on changes
+    "overlays": ([], _overlays),  # Extra overlay windows, see overlay_settings
+    "render_cache_mb": (64, _clamped(int, 1, 4096)),  # Default render cache budget
+    "prewarm_profiles": (5, _clamped(int, 0, 100)),  # Recently used profiles rendered ahead
+    "telemetry": (False, _flag),  # Opt-in runtime timings
+    "control_server": (False, _flag),  # Opt-in local socket API for external tools
+    "shape": ("png", _choice("png", "vector", "drawn")),
+    "animation": ("none", _choice("none", "file", "pulse", "spin")),
+    "animation_fps": (30, _clamped(int, 1, 240)),  # Frame rate of pulse and spin
+    "vector": (DEFAULT_VECTOR, _merged(DEFAULT_VECTOR, VECTOR_FIELDS)),
+    "drawing": (DEFAULT_DRAWING, _merged(DEFAULT_DRAWING, {"grid": _clamped(int, 8, 400), "strokes": _strokes})),
+    "hotkeys": (DEFAULT_HOTKEYS, _merged(DEFAULT_HOTKEYS)),
+}
+
+def setting_range(name):
+    # (low, high) of a numeric setting
+    return SETTINGS_SCHEMA[name][1].range
+
+def check_setting(name, value, fallback):
+    # Normalized value, or fallback if value is invalid. Unknown names pass through.
+    field = SETTINGS_SCHEMA.get(name)
+    if field is None:
+        return value
+    try:
+        return field[1](value)
+    except (TypeError, ValueError):
+        print("invalid setting:", name, repr(value))
+        return fallback
+
+def normalize_settings(data):
+    # Complete, valid settings from a settings.json or profile of any version:
+    # missing or null keys get their default, invalid values are replaced
+    settings = dict(data)
+    for name, (default, _) in SETTINGS_SCHEMA.items():
+        value = data.get(name)
+        if value is None:
+            settings[name] = copy.deepcopy(default)
+        else:
+            settings[name] = check_setting(name, value, copy.deepcopy(default))
+    return settings
 
 def load_settings():
-    if os.path.exists(SETTINGS_FILE):
-        with open(SETTINGS_FILE, "r") as f:
-            data = json.load(f)
-            data["x"] = int(data.get("x") or 0)
-            data["y"] = int(data.get("y") or 0)
-            if "hide_on_right_click" not in data:
-                data["hide_on_right_click"] = True
-            if "profile" not in data:
-                data["profile"] = "Default"
-            if "color" not in data:
-                data["color"] = "#FF0000"  # Default red
-            if "opacity" not in data:
-                data["opacity"] = 1.0  # Default fully opaque
-            if "use_color_overlay" not in data:
-                data["use_color_overlay"] = True
-            if "monitor_index" not in data:
-                data["monitor_index"] = 0  # Default to first monitor
-            if "follow_mouse" not in data:
-                data["follow_mouse"] = False  # Default to not follow mouse
-            if "timer_interval" not in data:
-                data["timer_interval"] = 10  # Default timer interval
-            return data
-    return {
-        "size": 40,
-        "crosshair": "crosshair.png",
-        "x": 0,
-        "y": 0,
-        "hide_on_right_click": True,
-        "profile": "Default",
-        "color": "#FF0000",        # Default red
-        "opacity": 1.0,            # Default fully opaque
-        "use_color_overlay": True,
-        "monitor_index": 0,           # Default to first monitor
-        "follow_mouse": False,         # Default to not follow mouse
-        "timer_interval": 10          # Default timer interval
-    }
+    return normalize_settings(json_store.load(SETTINGS_FILE) or {})
+
+class SettingsView:
+    # Typed values the per-tick and per-render paths read, derived once per
+    # settings change (Crosshair.refresh_view) instead of on every read
+    __slots__ = ("crosshair", "size", "color", "opacity", "use_overlay", "shape",
+                 "x_offset", "x_phase", "y_offset", "y_phase", "monitor_index",
+                 "follow_mouse", "follow_events")
+
+    def __init__(self, settings, monitor_count):
+        self.crosshair = settings["crosshair"]
+        self.size = settings["size"]
+        self.color = QtGui.QColor(settings["color"])
+        self.opacity = settings["opacity"]
+        self.use_overlay = settings["use_color_overlay"]
+        self.shape = settings["shape"]
+        self.x_offset, self.x_phase = split_offset(settings["x"])
+        self.y_offset, self.y_phase = split_offset(settings["y"])
+        index = settings["monitor_index"]
+        self.monitor_index = index if index < monitor_count else 0
+        self.follow_mouse = settings["follow_mouse"]
+        self.follow_events = settings["follow_events"]
 
 def save_settings(settings):
-    with open(SETTINGS_FILE, "w") as f:
-        json.dump(settings, f, indent=4)
+    json_store.save(SETTINGS_FILE, settings)
+
+class ProfileStore:
+    # Profiles in SQLite, one row per profile. The connection is opened on
+    # first use; lookups and writes touch a single row.
+    def __init__(self, path):
+        self.path = path
+        self.db = None
+
+    def connect(self):
+        if self.db is None:
+            import sqlite3
+            self.db = sqlite3.connect(self.path)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS profiles ("
+                "name TEXT PRIMARY KEY, data TEXT NOT NULL, last_used REAL NOT NULL DEFAULT 0)")
+            if self.db.execute("SELECT COUNT(*) FROM profiles").fetchone()[0] == 0:
+                self.import_profiles(json_store.load(PROFILES_FILE) or {"Default": load_settings()})
+        return self.db
+
+    def import_profiles(self, profiles):
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO profiles (name, data) VALUES (?, ?)",
+                [(name, json.dumps(normalize_settings(data))) for name, data in profiles.items()])
+
+    def names(self):
+        return [row[0] for row in self.connect().execute("SELECT name FROM profiles ORDER BY rowid")]
+
+    def get(self, name):
+        row = self.connect().execute("SELECT data FROM profiles WHERE name = ?", (name,)).fetchone()
+        return normalize_settings(json.loads(row[0])) if row else None
+
+    def put(self, name, data):
+        with self.connect():
+            self.db.execute(
+                "INSERT INTO profiles (name, data) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET data = excluded.data",
+                (name, json.dumps(data)))
+
+    def delete(self, name):
+        with self.connect():
+            self.db.execute("DELETE FROM profiles WHERE name = ?", (name,))
+
+    def touch(self, name):
+        with self.connect():
+            self.db.execute("UPDATE profiles SET last_used = ? WHERE name = ?", (time.time(), name))
+
+    def recent(self, count):
+        rows = self.connect().execute(
+            "SELECT name, data FROM profiles WHERE last_used > 0 ORDER BY last_used DESC LIMIT ?", (count,))
+        return [(name, normalize_settings(json.loads(data))) for name, data in rows]
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+profile_store = ProfileStore(PROFILES_DB)
 
 def load_profiles():
-    if os.path.exists(PROFILES_FILE):
-        with open(PROFILES_FILE, "r") as f:
-            return json.load(f)
-    return {"Default": load_settings()}
+    store = profile_store
+    return {name: store.get(name) for name in store.names()}
+
+def profile_data(settings):
+    # What a saved profile holds: the settings without the app's own
+    return {key: value for key, value in settings.items() if key not in APP_FIELDS}
+
+def profile_changes(name, prof):
+    # Settings update that loads a saved profile
+    changes = profile_data(prof)
+    changes["profile"] = name
+    return changes
+
+def overlay_settings(spec, base):
+    # Settings of an extra overlay window: its profile, or the main settings if
+    # it names none, overridden by the spec's own keys (monitor_index, x, y, ...)
+    profile = profile_store.get(spec.get("profile", "")) if spec.get("profile") else None
+    settings = copy.deepcopy(profile if profile is not None else base)
+    settings.pop("overlays", None)
+    settings.update(spec)
+    return normalize_settings(settings)
+
+def tint_image(image, color):
+    # Give every visible pixel the RGB of color while keeping its alpha,
+    # in one pass over the ARGB32 buffer instead of per-pixel Qt calls.
+    image = image.convertToFormat(QtGui.QImage.Format_ARGB32)
+    if image.isNull():
+        return image
+    ptr = image.bits()
+    ptr.setsize(image.bytesPerLine() * image.height())
+    np = load_numpy()
+    if np is not None:
+        rgb = color.rgb() & 0x00FFFFFF
+        pixels = np.frombuffer(ptr, dtype=np.uint32)
+        alpha = pixels & 0xFF000000
+        np.copyto(pixels, alpha | rgb, where=alpha != 0)
+        return image
+    # Without numpy, overwrite the color channels with strided slices. Fully
+    # transparent pixels get the color too, which never shows up on screen.
+    view = memoryview(ptr)
+    count = len(view) // 4
+    offsets = (2, 1, 0) if sys.byteorder == "little" else (1, 2, 3)
+    for offset, value in zip(offsets, (color.red(), color.green(), color.blue())):
+        view[offset::4] = bytes((value,)) * count
+    return image
+
+def load_source_image(path):
+    image = QtGui.QImage(path)
+    if not image.isNull():
+        image = image.convertToFormat(QtGui.QImage.Format_ARGB32)
+    return image
+
+def draw_default_crosshair_image(size, color):
+    image = QtGui.QImage(size, size, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtCore.Qt.transparent)
+    painter = QtGui.QPainter(image)
+    pen = QtGui.QPen(color, 2)
+    painter.setPen(pen)
+    painter.drawLine(size//2, 0, size//2, size)
+    painter.drawLine(0, size//2, size, size//2)
+    painter.end()
+    return image
+
+def prepare_source_image(source, color, use_overlay):
+    if use_overlay:
+        source = tint_image(source, color)
+    return source.convertToFormat(QtGui.QImage.Format_ARGB32_Premultiplied)
+
+def build_pyramid(image, min_size=16):
+    # Mipmap-style levels, each half the size of the previous one, so a
+    # target size can be resampled from a level less than twice as large
+    levels = [image]
+    while max(levels[-1].width(), levels[-1].height()) // 2 >= min_size:
+        prev = levels[-1]
+        levels.append(prev.scaled(max(1, prev.width() // 2), max(1, prev.height() // 2),
+                                  QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation))
+    return levels
+
+def scale_from_pyramid(levels, size):
+    target = levels[0].size().scaled(size, size, QtCore.Qt.KeepAspectRatio)
+    target.setWidth(max(1, target.width()))
+    target.setHeight(max(1, target.height()))
+    level = levels[0]
+    for candidate in levels[1:]:
+        if candidate.width() < target.width() or candidate.height() < target.height():
+            break
+        level = candidate
+    if level.size() == target:
+        return level
+    return level.scaled(target, QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation)
+
+def render_crosshair_image(source, size, color, opacity, use_overlay, levels=None):
+    # The whole tint/scale/opacity pipeline on QImage, so it can also run off
+    # the GUI thread. source is a decoded image, or None for the default cross.
+    # levels is an optional pyramid of the prepared source to scale from.
+    if source is None or source.isNull():
+        image = draw_default_crosshair_image(size, color)
+    else:
+        if levels is None:
+            levels = [prepare_source_image(source, color, use_overlay)]
+        image = scale_from_pyramid(levels, size)
+    return apply_opacity(image, opacity)
+
+def apply_opacity(image, opacity):
+    if opacity >= 1.0:
+        return image
+    temp = QtGui.QImage(image.size(), QtGui.QImage.Format_ARGB32_Premultiplied)
+    temp.setDevicePixelRatio(image.devicePixelRatio())
+    temp.fill(QtCore.Qt.transparent)
+    painter = QtGui.QPainter(temp)
+    painter.setOpacity(opacity)
+    painter.drawImage(0, 0, image)
+    painter.end()
+    return temp
+
+# Maps every alpha byte above 0 to 255, see alpha_region
+ALPHA_MASK_TABLE = bytes([0] + [255] * 255)
+
+def alpha_region(pixmap):
+    # Window shape covering every pixel with alpha > 0, in logical pixels
+    image = pixmap.toImage()
+    dpr = pixmap.devicePixelRatio()
+    if dpr != 1.0:
+        image = image.scaled(max(1, round(image.width() / dpr)), max(1, round(image.height() / dpr)),
+                             QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation)
+    alpha = image.convertToFormat(QtGui.QImage.Format_Alpha8)
+    data = alpha.constBits().asstring(alpha.sizeInBytes()).translate(ALPHA_MASK_TABLE)
+    opaque = QtGui.QImage(data, alpha.width(), alpha.height(), alpha.bytesPerLine(), QtGui.QImage.Format_Alpha8)
+    mask = opaque.convertToFormat(QtGui.QImage.Format_ARGB32_Premultiplied).createAlphaMask()
+    return QtGui.QRegion(QtGui.QBitmap.fromImage(mask))
+
+def vector_crosshair_path(params):
+    # Crosshair geometry centered on (0, 0)
+    thickness = max(1, int(params["thickness"]))
+    half = thickness / 2
+    gap = max(0, int(params["gap"]))
+    arm = max(0, int(params["arm_length"]))
+    path = QtGui.QPainterPath()
+    if arm:
+        path.addRect(QtCore.QRectF(gap, -half, arm, thickness))
+        path.addRect(QtCore.QRectF(-gap - arm, -half, arm, thickness))
+        path.addRect(QtCore.QRectF(-half, gap, thickness, arm))
+        if not params["t_shape"]:
+            path.addRect(QtCore.QRectF(-half, -gap - arm, thickness, arm))
+    if params["dot"]:
+        path.addRect(QtCore.QRectF(-half, -half, thickness, thickness))
+    radius = max(0, int(params["circle"]))
+    if radius:
+        ring = QtGui.QPainterPath()
+        ring.addEllipse(QtCore.QPointF(0, 0), radius + half, radius + half)
+        inner = QtGui.QPainterPath()
+        inner.addEllipse(QtCore.QPointF(0, 0), max(0.0, radius - half), max(0.0, radius - half))
+        path = path.united(ring.subtracted(inner))
+    return path.simplified()
+
+def render_vector_image(params, color, opacity, dpr=1.0):
+    # Rasterize the procedural crosshair straight at its final size and device
+    # pixel ratio, so there is no PNG decode and no resampling.
+    thickness = max(1, int(params["thickness"]))
+    outline = max(0, int(params["outline"]))
+    extent = max(params["gap"] + params["arm_length"], params["circle"] + thickness / 2, thickness / 2)
+    # An odd canvas for odd thickness keeps the arm edges on whole pixels
+    side = 2 * math.ceil(extent + outline + 1) + thickness % 2
+    image = QtGui.QImage(math.ceil(side * dpr), math.ceil(side * dpr), QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(dpr)
+    image.fill(QtCore.Qt.transparent)
+    path = vector_crosshair_path(params)
+    painter = QtGui.QPainter(image)
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    painter.translate(side / 2, side / 2)
+    if outline:
+        pen = QtGui.QPen(QtGui.QColor(0, 0, 0, color.alpha()), outline * 2)
+        pen.setJoinStyle(QtCore.Qt.MiterJoin)
+        painter.strokePath(path, pen)
+    painter.fillPath(path, color)
+    painter.end()
+    return apply_opacity(image, opacity)
+
+def stroke_paths(stroke, grid):
+    # The stroke and its mirror images, in grid pixels
+    values = stroke["points"]
+    points = [QtCore.QPointF(values[i], values[i + 1]) for i in range(0, len(values) - 1, 2)]
+    mirror = stroke.get("mirror", "none")
+    flips = [(False, False)]
+    if mirror in ("x", "xy"):
+        flips.append((True, False))
+    if mirror in ("y", "xy"):
+        flips.append((False, True))
+    if mirror == "xy":
+        flips.append((True, True))
+    paths = []
+    for flip_x, flip_y in flips:
+        flipped = [QtCore.QPointF(grid - p.x() if flip_x else p.x(), grid - p.y() if flip_y else p.y())
+                   for p in points]
+        if not flipped:
+            continue
+        path = QtGui.QPainterPath(flipped[0])
+        for point in flipped[1:] or flipped:  # A single point is drawn as a dot
+            path.lineTo(point)
+        paths.append(path)
+    return paths
+
+def stroke_pen(color, width):
+    return QtGui.QPen(color, width, QtCore.Qt.SolidLine, QtCore.Qt.RoundCap, QtCore.Qt.RoundJoin)
+
+def paint_strokes(painter, strokes, grid, color):
+    for stroke in strokes:
+        pen = stroke_pen(color, stroke["width"])
+        for path in stroke_paths(stroke, grid):
+            painter.strokePath(path, pen)
+
+def render_drawing_image(drawing, size, color, opacity, dpr=1.0):
+    # Rasterize the strokes straight at size logical pixels, like render_vector_image
+    side = math.ceil(size * dpr)
+    image = QtGui.QImage(side, side, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(dpr)
+    image.fill(QtCore.Qt.transparent)
+    painter = QtGui.QPainter(image)
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    painter.scale(size / drawing["grid"], size / drawing["grid"])
+    paint_strokes(painter, drawing["strokes"], drawing["grid"], color)
+    painter.end()
+    return apply_opacity(image, opacity)
+
+def load_animation_frames(path):
+    # Frames of an animated GIF/APNG and their delays in ms, or None when the
+    # file has a single frame
+    reader = QtGui.QImageReader(path)
+    if not reader.supportsAnimation():
+        return None
+    frames, delays = [], []
+    while True:
+        image = reader.read()
+        if image.isNull():
+            break
+        frames.append(image.convertToFormat(QtGui.QImage.Format_ARGB32))
+        delays.append(max(10, reader.nextImageDelay()))
+    return (frames, delays) if len(frames) > 1 else None
+
+def _transformed_frames(image, count, side, transform):
+    # Draws image into count square canvases of side device pixels, centered
+    # and transformed by transform(painter, i)
+    dpr = image.devicePixelRatio()
+    base = image.copy()
+    base.setDevicePixelRatio(1.0)
+    frames = []
+    for i in range(count):
+        frame = QtGui.QImage(side, side, QtGui.QImage.Format_ARGB32_Premultiplied)
+        frame.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(frame)
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        painter.translate(side / 2, side / 2)
+        transform(painter, i)
+        painter.drawImage(QtCore.QPointF(-base.width() / 2, -base.height() / 2), base)
+        painter.end()
+        frame.setDevicePixelRatio(dpr)
+        frames.append(frame)
+    return frames
+
+def spin_frames(image, count):
+    side = math.ceil(math.hypot(image.width(), image.height()))
+    return _transformed_frames(image, count, side, lambda painter, i: painter.rotate(360.0 * i / count))
+
+def pulse_frames(image, count):
+    def scale(painter, i):
+        factor = 0.85 + 0.15 * (0.5 + 0.5 * math.cos(2 * math.pi * i / count))
+        painter.scale(factor, factor)
+    return _transformed_frames(image, count, max(image.width(), image.height()), scale)
+
+def split_offset(value):
+    # Whole-pixel part and sub-pixel phase (0 .. SUBPIXEL_PHASES - 1) of an offset
+    whole = math.floor(value)
+    phase = round((value - whole) * SUBPIXEL_PHASES)
+    if phase == SUBPIXEL_PHASES:
+        return whole + 1, 0
+    return whole, phase
+
+def phase_shifted_image(image, dx, dy):
+    # The image moved right/down by a fraction of a logical pixel, on a canvas
+    # one logical pixel larger so nothing is clipped
+    dpr = image.devicePixelRatio()
+    base = image.copy()
+    base.setDevicePixelRatio(1.0)
+    pad = math.ceil(dpr)
+    shifted = QtGui.QImage(base.width() + pad, base.height() + pad, QtGui.QImage.Format_ARGB32_Premultiplied)
+    shifted.fill(QtCore.Qt.transparent)
+    painter = QtGui.QPainter(shifted)
+    painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+    painter.translate(dx * dpr, dy * dpr)
+    painter.drawImage(0, 0, base)
+    painter.end()
+    shifted.setDevicePixelRatio(dpr)
+    return shifted
+
+def _changed_rect(a, b):
+    # Bounding box, in device pixels, of the pixels that differ between frames
+    np = load_numpy()
+    if np is None:
+        return b.rect()
+    size = a.bytesPerLine() * a.height()
+    pa = np.frombuffer(a.constBits().asstring(size), np.uint32).reshape(a.height(), -1)
+    pb = np.frombuffer(b.constBits().asstring(size), np.uint32).reshape(b.height(), -1)
+    diff = pa != pb
+    rows = np.flatnonzero(diff.any(axis=1))
+    if not rows.size:
+        return QtCore.QRect()
+    cols = np.flatnonzero(diff.any(axis=0))
+    return QtCore.QRect(int(cols[0]), int(rows[0]), int(cols[-1] - cols[0] + 1), int(rows[-1] - rows[0] + 1))
+
+class FrameAtlas:
+    # Every frame of an animation pre-rasterized into one pixmap. Painting a
+    # frame is a single blit; dirty[i] is the logical rect that changes when
+    # frame i replaces frame i - 1. Building it uses QImage only and may run
+    # in the render pool; upload() makes the pixmap on the GUI thread.
+    def __init__(self, frames, delays=None):
+        premultiplied = QtGui.QImage.Format_ARGB32_Premultiplied
+        frames = [frame.convertToFormat(premultiplied) for frame in frames]
+        self.count = len(frames)
+        self.delays = delays
+        self.dpr = frames[0].devicePixelRatio()
+        fw, fh = frames[0].width(), frames[0].height()
+        cols = math.ceil(math.sqrt(self.count))
+        rows = math.ceil(self.count / cols)
+        atlas = QtGui.QImage(cols * fw, rows * fh, premultiplied)
+        atlas.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(atlas)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+        self.sources = []
+        for i, frame in enumerate(frames):
+            frame.setDevicePixelRatio(1.0)
+            source = QtCore.QRect(i % cols * fw, i // cols * fh, fw, fh)
+            painter.drawImage(source.topLeft(), frame)
+            self.sources.append(source)
+        painter.end()
+        self.image = atlas
+        self.pixmap = None
+        self.nbytes = atlas.bytesPerLine() * atlas.height()
+        self.frame_size = QtCore.QSize(round(fw / self.dpr), round(fh / self.dpr))
+        self.dirty = []
+        for i, frame in enumerate(frames):
+            rect = _changed_rect(frames[i - 1], frame)
+            self.dirty.append(QtCore.QRect(
+                math.floor(rect.x() / self.dpr), math.floor(rect.y() / self.dpr),
+                math.ceil(rect.width() / self.dpr) + 1, math.ceil(rect.height() / self.dpr) + 1))
+
+    def upload(self):
+        self.pixmap = QtGui.QPixmap.fromImage(self.image)
+        self.image = None
+        return self
+
+class PrewarmTask(QtCore.QRunnable):
+    # Renders crosshairs for profiles that are likely to be selected next.
+    # Each finished QImage is handed back to the GUI thread through a signal.
+    def __init__(self, jobs, rendered):
+        super().__init__()
+        self.jobs = jobs
+        self.rendered = rendered
+
+    def run(self):
+        for key, path, size, color, opacity, use_overlay in self.jobs:
+            try:
+                source = load_source_image(path) if key[1] is not None else None
+                self.rendered.emit(key, render_crosshair_image(source, size, color, opacity, use_overlay))
+            except Exception as e:
+                print("prewarm error:", e)
+
+class RenderTask(QtCore.QRunnable):
+    # Renders the current crosshair off the GUI thread, on QImage only. source
+    # and levels are the cached decode/pyramid if the GUI thread had them. The
+    # task skips its remaining steps once a newer request has been made.
+    # With animate, the frames of an animated GIF/APNG are rendered into a
+    # FrameAtlas as well (False when the file has a single frame). finished
+    # is the main overlay's signal even for extra overlays, which may be
+    # deleted while the task runs.
+    def __init__(self, window, request, latest, job, source, levels, animate, finished):
+        super().__init__()
+        self.window = window
+        self.request = request
+        self.latest = latest
+        self.job = job
+        self.source = source
+        self.levels = levels
+        self.animate = animate
+        self.finished = finished
+
+    def run(self):
+        key, path, file_id, size, color, opacity, use_overlay = self.job
+        source, levels, image, atlas = self.source, self.levels, None, None
+        if self.latest() != self.request:
+            return
+        try:
+            if source is None and file_id is not None:
+                source = load_source_image(path)
+            if self.latest() != self.request:
+                return
+            if levels is None and source is not None and not source.isNull():
+                levels = build_pyramid(prepare_source_image(source, color, use_overlay))
+            if self.latest() != self.request:
+                return
+            image = render_crosshair_image(source, size, color, opacity, use_overlay, levels)
+            if self.animate and self.latest() == self.request:
+                loaded = load_animation_frames(path)
+                atlas = False
+                if loaded is not None:
+                    frames, delays = loaded
+                    frames = [render_crosshair_image(frame, size, color, opacity, use_overlay) for frame in frames]
+                    atlas = FrameAtlas(frames, delays)
+        except Exception as e:
+            print("render error:", e)
+        self.finished.emit(self.window, self.request, self.job, image, source, levels, atlas)
+
+def read_profiles(path=None):
+    # Normalized profiles from a profiles.json or profiles.db, or the app's own store
+    if path is None:
+        return load_profiles()
+    if path.endswith(".db"):
+        store = ProfileStore(path)
+        try:
+            return {name: store.get(name) for name in store.names()}
+        finally:
+            store.close()
+    with open(path, "r") as f:
+        return {name: normalize_settings(data) for name, data in json.load(f).items()}
+
+def export_jobs(profiles, sizes, colors, scales, out_dir):
+    # One job per profile, size, color and scale: (file, profile, size, color, dpr).
+    # Vector shapes have no size, they are rendered once per color and scale.
+    jobs = []
+    for name, prof in profiles.items():
+        safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+        for size in sizes if sizes and prof["shape"] != "vector" else [prof["size"]]:
+            for color in colors or [prof["color"]]:
+                for dpr in scales:
+                    suffix = "" if dpr == 1 else f"@{dpr:g}x"
+                    file_name = f"{safe_name}_{size}px_{QtGui.QColor(color).name()[1:]}{suffix}.png"
+                    jobs.append((os.path.join(out_dir, file_name), prof, size, color, dpr))
+    return jobs
+
+_export_pyramids = {}  # Per worker process: (path, color, use_overlay) -> pyramid
+
+def export_job(job):
+    # Runs in a render pool worker. Renders one crosshair with the overlay's
+    # QImage pipeline and writes it; returns (file, ms, error or None).
+    path, prof, size, color_name, dpr = job
+    started = time.perf_counter()
+    try:
+        color = QtGui.QColor(color_name)
+        opacity = prof["opacity"]
+        if prof["shape"] == "vector":
+            image = render_vector_image(prof["vector"], color, opacity, dpr)
+        elif prof["shape"] == "drawn":
+            image = render_drawing_image(prof["drawing"], size, color, opacity, dpr)
+        else:
+            use_overlay = prof["use_color_overlay"]
+            key = (prof["crosshair"], color.name(QtGui.QColor.HexArgb), use_overlay)
+            levels = _export_pyramids.get(key)
+            source = None
+            if levels is None:
+                source = load_source_image(prof["crosshair"])
+                if source.isNull():
+                    raise ValueError(f"cannot read {prof['crosshair']}")  # The overlay would draw its default cross
+                levels = build_pyramid(prepare_source_image(source, color, use_overlay))
+                _export_pyramids[key] = levels
+            else:
+                source = levels[0]
+            image = render_crosshair_image(source, round(size * dpr), color, opacity, use_overlay, levels)
+        if not image.save(path):
+            raise OSError(f"cannot write {path}")
+        return path, (time.perf_counter() - started) * 1000, None
+    except Exception as e:
+        return path, (time.perf_counter() - started) * 1000, str(e)
+
+def render_main(argv):
+    # crosshairZ.py render: every profile at the given sizes, colors and
+    # scales as PNG files, on a process pool and without any window
+    import argparse
+    from concurrent.futures import ProcessPoolExecutor
+    parser = argparse.ArgumentParser(prog="crosshairZ.py render",
+                                     description="Render profiles to PNG files without opening the overlay")
+    parser.add_argument("--profiles", help="profiles.json or profiles.db (default: the app's profiles)")
+    parser.add_argument("--sizes", default="", help="comma separated sizes in px (default: each profile's size)")
+    parser.add_argument("--colors", default="", help="comma separated colors (default: each profile's color)")
+    parser.add_argument("--scales", default="1", help="comma separated device pixel ratios, e.g. 1,1.5,2")
+    parser.add_argument("--out", default="export", help="output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="render processes")
+    parser.add_argument("--report", help="write per-image timings as JSON to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = [int(size) for size in args.sizes.split(",") if size]
+    except ValueError:
+        parser.error(f"invalid sizes: {args.sizes}")
+    low, high = setting_range("size")
+    if not all(low <= size <= high for size in sizes):
+        parser.error(f"sizes must be between {low} and {high}: {args.sizes}")
+    colors = [color for color in args.colors.split(",") if color]
+    for color in colors:
+        if not QtGui.QColor.isValidColor(color):
+            parser.error(f"invalid color: {color}")
+    try:
+        scales = [float(scale) for scale in args.scales.split(",") if scale]
+    except ValueError:
+        parser.error(f"invalid scales: {args.scales}")
+    if not all(scale > 0 for scale in scales):
+        parser.error(f"scales must be positive: {args.scales}")
+    os.makedirs(args.out, exist_ok=True)
+    jobs = export_jobs(read_profiles(args.profiles), sizes, colors, scales, args.out)
+    workers = max(1, min(args.workers, len(jobs)))
+    started = time.perf_counter()
+    if workers > 1:
+        # Neighboring jobs share a source PNG; chunks keep them in one worker's pyramid cache
+        chunk = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(export_job, jobs, chunksize=chunk))
+    else:
+        results = [export_job(job) for job in jobs]
+    elapsed = time.perf_counter() - started
+
+    failed = [(path, error) for path, _, error in results if error]
+    for path, error in failed:
+        print("render error:", path, error)
+    times = sorted(ms for _, ms, _ in results)
+    rate = len(results) / elapsed if elapsed else 0.0
+    print(f"{len(results)} images ({len(failed)} failed) in {elapsed:.2f} s with {workers} workers, "
+          f"{rate:.1f} images/s")
+    print(f"per image: p50 {percentile(times, 0.5):.2f} ms, p95 {percentile(times, 0.95):.2f} ms, "
+          f"max {percentile(times, 1.0):.2f} ms")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({
+                "workers": workers,
+                "seconds": elapsed,
+                "images_per_s": rate,
+                "images": [{"file": path, "ms": ms, "error": error} for path, ms, error in results],
+            }, f, indent=4)
+    return 1 if failed else 0
+
+class RenderCache:
+    # LRU of decoded source images and finished crosshair pixmaps sharing one
+    # byte budget. Render keys carry the file mtime/size, so edited PNGs miss.
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (value, nbytes)
+        self.bytes_used = 0
+        self.counters = {
+            "source_hits": 0, "source_misses": 0,
+            "hits": 0, "misses": 0, "evictions": 0,
+        }
+
+    def file_id(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+    def render_key(self, file_id, size, color, opacity, use_overlay):
+        return ("pixmap", file_id, int(size), color.name(QtGui.QColor.HexArgb),
+                round(float(opacity), 3), bool(use_overlay))
+
+    def cached_source(self, file_id):
+        image = self._lookup(("source", file_id))
+        self.counters["source_hits" if image is not None else "source_misses"] += 1
+        return image
 
-def save_profiles(profiles):
-    with open(PROFILES_FILE, "w") as f:
-        json.dump(profiles, f, indent=4)
+    def store_source(self, file_id, image):
+        self._store(("source", file_id), image, image.bytesPerLine() * image.height())
+
+    def vector_key(self, params, color, opacity, dpr):
+        return ("vector", tuple(sorted(params.items())), color.name(QtGui.QColor.HexArgb),
+                round(float(opacity), 3), float(dpr))
+
+    def drawing_key(self, drawing, size, color, opacity, dpr):
+        return ("drawn", json.dumps(drawing, sort_keys=True), size, color.name(QtGui.QColor.HexArgb),
+                round(float(opacity), 3), float(dpr))
+
+    def cached_pyramid(self, file_id, color, use_overlay):
+        return self._lookup(self._pyramid_key(file_id, color, use_overlay))
+
+    def store_pyramid(self, file_id, color, use_overlay, levels):
+        self._store(self._pyramid_key(file_id, color, use_overlay), levels,
+                    sum(level.bytesPerLine() * level.height() for level in levels))
+
+    def _pyramid_key(self, file_id, color, use_overlay):
+        return ("pyramid", file_id, color.name() if use_overlay else None, bool(use_overlay))
+
+    def contains(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        pixmap = self._lookup(key)
+        self.counters["hits" if pixmap is not None else "misses"] += 1
+        return pixmap
+
+    def put(self, key, pixmap, nbytes=None):
+        if nbytes is None:
+            nbytes = pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+        self._store(key, pixmap, nbytes)
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes_used = 0
+
+    def set_budget(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def stats(self):
+        return {**self.counters, "entries": len(self.entries),
+                "bytes": self.bytes_used, "max_bytes": self.max_bytes}
+
+    def _lookup(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def _store(self, key, value, nbytes):
+        if nbytes > self.max_bytes:
+            return  # Never let one huge image flush the whole cache
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes_used -= old[1]
+        self.entries[key] = (value, nbytes)
+        self.bytes_used += nbytes
+        self._evict()
+
+    def _evict(self):
+        while self.bytes_used > self.max_bytes and self.entries:
+            _, (_, nbytes) = self.entries.popitem(last=False)
+            self.bytes_used -= nbytes
+            self.counters["evictions"] += 1
+
+render_cache = RenderCache()
+
+def format_pipeline_stats(stats):
+    return ", ".join(f"{stage} {stats[stage]}/{stats['calls']}" for stage in UPDATE_STAGES)
+
+def format_cache_stats(stats):
+    return (f"hits {stats['hits']}, misses {stats['misses']}, "
+            f"evictions {stats['evictions']}, "
+            f"{stats['bytes'] / (1024 * 1024):.1f}/{stats['max_bytes'] / (1024 * 1024):.0f} MB")
+
+class HotkeyDispatcher:
+    # One global keyboard hook for every binding. Keys are resolved to actions
+    # with a dict lookup on the hook thread; only bound keys reach the GUI.
+    REPEATABLE = ("nudge_left", "nudge_right", "nudge_up", "nudge_down")
+
+    def __init__(self, target, keymap):
+        self.target = target
+        self.table = {}
+        self.held = set()
+        self.hook = None
+        self.keyboard = None
+        self.latencies = deque(maxlen=256)  # press-to-action, seconds
+        self.set_keymap(keymap)
+
+    def set_keymap(self, keymap):
+        self.table = {key.lower(): action for action, key in keymap.items() if key}
+
+    def start(self):
+        if self.hook is None:
+            import keyboard
+            self.keyboard = keyboard
+            self.hook = keyboard.hook(self.on_key)
+
+    def stop(self):
+        if self.hook is not None:
+            self.keyboard.unhook(self.hook)
+            self.hook = None
+
+    def on_key(self, event):
+        name = (event.name or "").lower()
+        if event.event_type == self.keyboard.KEY_UP:
+            self.held.discard(name)
+            return
+        action = self.table.get(name)
+        if action is None:
+            return
+        if name in self.held and action not in self.REPEATABLE:
+            return  # Ignore auto-repeat for toggles
+        self.held.add(name)
+        QtCore.QMetaObject.invokeMethod(
+            self.target, "run_hotkey", QtCore.Qt.QueuedConnection,
+            QtCore.Q_ARG(str, action), QtCore.Q_ARG(float, time.perf_counter()))
+
+    def record_latency(self, pressed_at):
+        latency = time.perf_counter() - pressed_at
+        self.latencies.append(latency)
+        if telemetry.enabled:
+            telemetry.record("hotkey_latency", latency * 1000)
+
+    def stats(self):
+        if not self.latencies:
+            return "no presses yet"
+        ordered = sorted(self.latencies)
+        return (f"{len(ordered)} presses, {sum(ordered) / len(ordered) * 1000:.2f} ms mean, "
+                f"{percentile(ordered, 0.5) * 1000:.2f} ms p50, {ordered[-1] * 1000:.2f} ms max")
+
+class RightClickFilter:
+    # Listener-side right click handling. Only changes of the wanted hidden
+    # state are forwarded, and at most one apply_click_state call is queued
+    # at a time; it reads the newest state when it runs.
+    def __init__(self, target):
+        self.target = target
+        self.button = None  # pynput's right button, set when the listener starts
+        self.enabled = True
+        self.toggle = False
+        self.pressed = False
+        self.hidden = False
+        self.queued = False
+        self.changed_at = 0.0
+        self.counters = {"events": 0, "transitions": 0, "queued": 0, "coalesced": 0}
+        self.overhead = deque(maxlen=256)  # Per-event filter cost, seconds
+
+    def configure(self, settings):
+        self.enabled = settings["hide_on_right_click"]
+        self.toggle = settings["right_click_mode"] == "toggle"
+        self.reset()
+
+    def reset(self):
+        self.pressed = False
+        self.hidden = False
+
+    def on_click(self, button, pressed):
+        started = time.perf_counter()
+        self.counters["events"] += 1
+        if button != self.button or not self.enabled or pressed == self.pressed:
+            return  # Other buttons, and presses/releases that repeat the last edge
+        self.pressed = pressed
+        if self.toggle:
+            if not pressed:
+                return
+            hidden = not self.hidden
+        else:
+            hidden = pressed
+        self.hidden = hidden
+        self.changed_at = started
+        self.counters["transitions"] += 1
+        if self.queued:
+            self.counters["coalesced"] += 1
+        else:
+            self.queued = True
+            self.counters["queued"] += 1
+            QtCore.QMetaObject.invokeMethod(self.target, "apply_click_state", QtCore.Qt.QueuedConnection)
+        elapsed = time.perf_counter() - started
+        self.overhead.append(elapsed)
+        if telemetry.enabled:
+            telemetry.record("click_filter", elapsed * 1000)
+
+    def stats(self):
+        text = ("{events} events, {transitions} edges, {queued} queued, "
+                "{coalesced} coalesced").format(**self.counters)
+        if self.overhead:
+            text += f", {sum(self.overhead) / len(self.overhead) * 1e6:.1f} us/edge"
+        return text
+
+class CursorPredictor:
+    # Alpha-beta filter over timestamped cursor samples for follow mode. The
+    # overlay goes to the measured position plus the filtered velocity times
+    # the horizon, i.e. where the cursor should be once the move is on screen.
+    # A repeated position means the cursor stopped and snaps back to it.
+    ALPHA = 0.85  # Position gain
+    BETA = 0.3  # Velocity gain
+    MAX_GAP = 0.1  # Seconds without samples after which motion starts over
+    MAX_LEAD = 200  # Pixels
+
+    def __init__(self, horizon_ms=0):
+        self.horizon = 0.0
+        self.pending = deque()  # (due, predicted x, y, unpredicted x, y) awaiting the real position
+        self.errors = {"predicted": deque(maxlen=1024), "unpredicted": deque(maxlen=1024)}
+        self.configure(horizon_ms)
+
+    def configure(self, horizon_ms):
+        self.horizon = horizon_ms / 1000
+        self.reset()
+
+    def reset(self):
+        self.last = None  # Newest sample, (t, x, y)
+        self.x = self.y = 0.0
+        self.vx = self.vy = 0.0
+        self.pending.clear()
+
+    def predict(self, x, y, t):
+        # Overlay position for the cursor at (x, y) sampled at t (seconds)
+        self.score(x, y, t)
+        last = self.last
+        if last is None or t - last[0] > self.MAX_GAP or (x, y) == last[1:]:
+            self.x, self.y, self.vx, self.vy = x, y, 0.0, 0.0
+            px, py = x, y
+        elif t > last[0]:
+            dt = t - last[0]
+            ex = x - (self.x + self.vx * dt)
+            ey = y - (self.y + self.vy * dt)
+            self.x += self.vx * dt + self.ALPHA * ex
+            self.y += self.vy * dt + self.ALPHA * ey
+            self.vx += self.BETA * ex / dt
+            self.vy += self.BETA * ey / dt
+            lead = self.MAX_LEAD
+            px = x + max(-lead, min(lead, self.vx * self.horizon))
+            py = y + max(-lead, min(lead, self.vy * self.horizon))
+        else:
+            return x, y  # Same timestamp, keep the state
+        self.last = (t, x, y)
+        self.pending.append((t + self.horizon, px, py, x, y))
+        return px, py
+
+    def score(self, x, y, t):
+        # Distance of each due output, and of the raw sample it came from, to
+        # where the cursor was when it showed up on screen (interpolated)
+        while self.pending and self.pending[0][0] <= t:
+            due, px, py, ux, uy = self.pending.popleft()
+            t0, x0, y0 = self.last
+            if t - t0 > self.MAX_GAP:
+                ax, ay = x0, y0  # Stopped somewhere in the gap, assume right away
+            else:
+                f = (due - t0) / (t - t0) if t > t0 else 1.0
+                ax, ay = x0 + (x - x0) * f, y0 + (y - y0) * f
+            self.errors["predicted"].append(math.hypot(px - ax, py - ay))
+            self.errors["unpredicted"].append(math.hypot(ux - ax, uy - ay))
+
+    def error_stats(self):
+        result = {}
+        for name, values in self.errors.items():
+            values = sorted(values)
+            if values:
+                result[name] = {
+                    "mean_px": sum(values) / len(values),
+                    "p95_px": percentile(values, 0.95),
+                }
+        return result
+
+    def stats(self):
+        if not self.horizon:
+            return "off"
+        errors = self.error_stats()
+        if not errors:
+            return "no samples yet"
+        return ("{0[mean_px]:.1f} px mean, {0[p95_px]:.1f} px p95 "
+                "(unpredicted {1[mean_px]:.1f} / {1[p95_px]:.1f})").format(
+                    errors["predicted"], errors["unpredicted"])
+
+class Telemetry:
+    # Opt-in runtime timings. Each metric keeps its newest samples in a ring
+    # buffer; callers check `enabled` first so the disabled cost is one lookup.
+    METRICS = {
+        "tick_jitter": "Poll timer tick jitter",
+        "move_latency": "Cursor event to move()",
+        "hide_latency": "Right click to hide",
+        "click_filter": "Click event filtering",
+        "render": "load_crosshair duration",
+        "hotkey_latency": "Hotkey press to action",
+        "animation_frame": "Animation frame paint",
+        "control": "Control batch apply",
+    }
+    BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66)  # Histogram upper edges, ms
+
+    def __init__(self, size=2048):
+        self.enabled = False
+        self.samples = {name: deque(maxlen=size) for name in self.METRICS}
+
+    def record(self, metric, ms):
+        self.samples[metric].append((time.time(), ms))
+
+    def clear(self):
+        for samples in self.samples.values():
+            samples.clear()
+
+    def histogram(self, values):
+        counts = [0] * (len(self.BUCKETS) + 1)
+        for value in values:
+            for i, edge in enumerate(self.BUCKETS):
+                if value <= edge:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return counts
+
+    def summary(self):
+        result = {}
+        for name, samples in self.samples.items():
+            values = sorted(ms for _, ms in samples)
+            if not values:
+                result[name] = {"count": 0}
+                continue
+            result[name] = {
+                "count": len(values),
+                "mean_ms": sum(values) / len(values),
+                "p50_ms": percentile(values, 0.5),
+                "p95_ms": percentile(values, 0.95),
+                "p99_ms": percentile(values, 0.99),
+                "max_ms": values[-1],
+                "histogram": self.histogram(values),
+            }
+        return result
+
+    def export_json(self, path):
+        data = {
+            "buckets_ms": list(self.BUCKETS),
+            "summary": self.summary(),
+            "samples": {name: list(samples) for name, samples in self.samples.items()},
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+
+    def export_csv(self, path):
+        with open(path, "w", newline="") as f:
+            import csv
+            writer = csv.writer(f)
+            writer.writerow(["metric", "timestamp", "ms"])
+            for name, samples in self.samples.items():
+                for timestamp, ms in samples:
+                    writer.writerow([name, f"{timestamp:.6f}", f"{ms:.4f}"])
+
+telemetry = Telemetry()
+
+class StartupProfile:
+    # Phase-by-phase launch timings, printed with --profile-startup
+    def __init__(self, started):
+        self.enabled = False
+        self.started = started
+        self.last = started
+        self.phases = []
+
+    def mark(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def report(self):
+        width = max((len(phase) for phase, _ in self.phases), default=0)
+        for phase, ms in self.phases:
+            print(f"{phase:<{width}}  {ms:8.1f} ms")
+        print(f"{'total':<{width}}  {(self.last - self.started) * 1000:8.1f} ms")
+
+startup_profile = StartupProfile(MODULE_STARTED)
+
+def load_last_render(key):
+    # The pixmap saved by save_last_render, if it was rendered for this key
+    reader = QtGui.QImageReader(LAST_RENDER_FILE)
+    if reader.text("render_key") != repr(key):
+        return None
+    image = reader.read()
+    if image.isNull():
+        return None
+    image.setDevicePixelRatio(float(reader.text("dpr") or 1.0))
+    return QtGui.QPixmap.fromImage(image)
+
+def save_last_render(pixmap, key):
+    image = pixmap.toImage()
+    image.setText("render_key", repr(key))
+    image.setText("dpr", str(pixmap.devicePixelRatio()))
+    tmp = LAST_RENDER_FILE + ".tmp"
+    if image.save(tmp, "PNG"):
+        os.replace(tmp, LAST_RENDER_FILE)
+
+def parse_commands(line):
+    # One control request: commands separated by ";", e.g.
+    # "profile Range; set color #00FF00; nudge 1 0". Returns [(name, args)].
+    commands = []
+    for part in line.split(";"):
+        name, _, rest = part.strip().partition(" ")
+        rest = rest.strip()
+        if not name:
+            continue
+        if name in ("profile", "get"):
+            if not rest:
+                raise ValueError(f"{name} needs a name")
+            args = rest
+        elif name == "set":
+            key, _, text = rest.partition(" ")
+            try:
+                value = json.loads(text)
+            except ValueError:
+                value = text.strip()  # Bare text, e.g. a color
+            args = (key, value)
+        elif name in ("nudge", "move"):
+            try:
+                dx, dy = (float(value) for value in rest.split())
+            except ValueError:
+                raise ValueError(f"{name} needs dx dy") from None
+            args = (dx, dy)
+        elif name in ("show", "hide", "toggle", "ping"):
+            args = None
+        else:
+            raise ValueError(f"unknown command {name!r}")
+        commands.append((name, args))
+    return commands
+
+class ControlServer(QtCore.QObject):
+    # Local socket API for external tools (stream decks, launch scripts).
+    # Each line a client sends is one batch (see parse_commands and
+    # Crosshair.run_commands); the reply is one JSON line with "ok", "ms"
+    # (time spent applying) and "values" or "error".
+    def __init__(self, target, name=CONTROL_SERVER_NAME):
+        super().__init__(target)
+        from PyQt5 import QtNetwork
+        self.target = target
+        self.name = name
+        self.server = QtNetwork.QLocalServer(self)
+        self.server.newConnection.connect(self.on_connection)
+        self.requests = 0
+
+    def start(self):
+        from PyQt5 import QtNetwork
+        if self.server.isListening():
+            return True
+        probe = QtNetwork.QLocalSocket()
+        probe.connectToServer(self.name)
+        if probe.waitForConnected(100):
+            probe.abort()
+            print("control server error: already running in another instance")
+            return False
+        self.server.removeServer(self.name)  # Nobody answers: a stale socket left by a crash
+        if not self.server.listen(self.name):
+            print("control server error:", self.server.errorString())
+            return False
+        return True
+
+    def stop(self):
+        self.server.close()
+
+    def on_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect(lambda socket=socket: self.on_ready_read(socket))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def on_ready_read(self, socket):
+        while socket.canReadLine():
+            line = bytes(socket.readLine()).decode("utf-8", "replace").strip()
+            socket.write((json.dumps(self.handle(line)) + "\n").encode("utf-8"))
+        socket.flush()
+
+    def handle(self, line):
+        started = time.perf_counter()
+        try:
+            reply = {"ok": True, "values": self.target.run_commands(parse_commands(line))}
+        except ValueError as e:
+            reply = {"ok": False, "error": str(e)}
+        except Exception as e:  # Raised in a Qt slot it would abort the app
+            print("control error:", repr(e))
+            reply = {"ok": False, "error": repr(e)}
+        elapsed = (time.perf_counter() - started) * 1000
+        reply["ms"] = elapsed
+        self.requests += 1
+        if telemetry.enabled:
+            telemetry.record("control", elapsed)
+        return reply
+
+def control_main(argv):
+    # crosshairZ.py ctl: client of the control API
+    import argparse
+    from PyQt5 import QtNetwork
+    parser = argparse.ArgumentParser(prog="crosshairZ.py ctl", description="Send commands to a running crosshairZ")
+    parser.add_argument("commands", nargs="+", help='e.g. "profile Range; set color #00FF00; nudge 1 0"')
+    parser.add_argument("--server", default=CONTROL_SERVER_NAME, help="local socket name")
+    parser.add_argument("--repeat", type=int, default=1, help="send the batch this many times and report latency")
+    args = parser.parse_args(argv)
+
+    socket = QtNetwork.QLocalSocket()
+    socket.connectToServer(args.server)
+    if not socket.waitForConnected(1000):
+        print("cannot connect:", socket.errorString(), "(is \"control_server\" enabled?)")
+        return 1
+    line = (" ".join(args.commands) + "\n").encode("utf-8")
+    times = []
+    for _ in range(max(1, args.repeat)):
+        started = time.perf_counter()
+        socket.write(line)
+        socket.flush()
+        while not socket.canReadLine():
+            if not socket.waitForReadyRead(2000):
+                print("no reply:", socket.errorString())
+                return 1
+        reply = json.loads(bytes(socket.readLine()).decode("utf-8"))
+        times.append((time.perf_counter() - started) * 1000)
+    socket.disconnectFromServer()
+    print(json.dumps(reply))
+    times.sort()
+    if len(times) == 1:
+        print(f"round trip {times[0]:.3f} ms (applying {reply['ms']:.3f} ms)")
+    else:
+        print(f"round trip over {len(times)} batches: p50 {percentile(times, 0.5):.3f} ms, "
+              f"p95 {percentile(times, 0.95):.3f} ms, "
+              f"max {times[-1]:.3f} ms")
+    return 0 if reply["ok"] else 1
+
+class ScreenIndex(QtCore.QObject):
+    # Monitor geometries and the last clamped fixed-mode position, rebuilt only
+    # when a screen is added, removed or changes geometry.
+    changed = QtCore.pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.geometries = []
+        self.ratios = []
+        self.target_key = None
+        self.target = None
+        app = QtWidgets.QApplication.instance()
+        app.screenAdded.connect(self.on_screen_added)
+        app.screenRemoved.connect(self.on_screen_removed)
+        for screen in app.screens():
+            screen.geometryChanged.connect(self.invalidate)
+        self.rebuild()
+
+    def on_screen_added(self, screen):
+        screen.geometryChanged.connect(self.invalidate)
+        self.invalidate()
+
+    def on_screen_removed(self, screen):
+        self.rebuild(exclude=screen)
+        self.changed.emit()
+
+    def invalidate(self, *args):
+        self.rebuild()
+        self.changed.emit()
+
+    def rebuild(self, exclude=None):
+        screens = [screen for screen in QtWidgets.QApplication.screens() if screen is not exclude]
+        self.geometries = [screen.geometry() for screen in screens]
+        self.ratios = [screen.devicePixelRatio() for screen in screens]
+        self.target_key = None
+
+    def count(self):
+        return len(self.geometries)
+
+    def device_pixel_ratio(self, monitor_index):
+        if not self.ratios:
+            return 1.0
+        return self.ratios[monitor_index if monitor_index < len(self.ratios) else 0]
+
+    def fixed_target(self, monitor_index, w, h, x_offset, y_offset):
+        key = (monitor_index, w, h, x_offset, y_offset)
+        if key == self.target_key:
+            return self.target
+        if not self.geometries:
+            return None
+        if monitor_index >= len(self.geometries):
+            monitor_index = 0
+        screen = self.geometries[monitor_index]
+        center_x = screen.center().x() - w // 2 + x_offset
+        center_y = screen.center().y() - h // 2 + y_offset
+
+        min_x = screen.left()
+        max_x = screen.right() - w
+        min_y = screen.top()
+        max_y = screen.bottom() - h
+        center_x = max(min_x, min(center_x, max_x))
+        center_y = max(min_y, min(center_y, max_y))
+        self.target_key = key
+        self.target = (center_x, center_y)
+        return self.target
 
 class SettingsDialog(QtWidgets.QDialog):
     def __init__(self, settings, crosshair, parent=None):
@@ -82,7 +1589,7 @@ class SettingsDialog(QtWidgets.QDialog):
 
         # Crosshair size slider
         self.sizeSlider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
-        self.sizeSlider.setRange(10, 400)
+        self.sizeSlider.setRange(*setting_range("size"))
         self.sizeSlider.setValue(settings["size"])
         self.sizeSlider.setFocusPolicy(QtCore.Qt.NoFocus)
         self.sizeLabel = QtWidgets.QLabel(str(settings["size"]))
@@ -93,26 +1600,35 @@ class SettingsDialog(QtWidgets.QDialog):
 
         # Step size spinbox
         self.stepSpinBox = QtWidgets.QDoubleSpinBox()
-        self.stepSpinBox.setRange(0.1, 10.0)
+        self.stepSpinBox.setRange(*setting_range("step"))
         self.stepSpinBox.setSingleStep(0.1)
-        self.stepSpinBox.setValue(settings.get("step", 0.1))
+        self.stepSpinBox.setValue(settings["step"])
         layout.addRow("Step Size:", self.stepSpinBox)
 
         # Hide on right click checkbox
         self.hideRightClickCheck = QtWidgets.QCheckBox("Hide on right click")
-        self.hideRightClickCheck.setChecked(settings.get("hide_on_right_click", True))
+        self.hideRightClickCheck.setChecked(settings["hide_on_right_click"])
         layout.addRow(self.hideRightClickCheck)
+        self.rightClickModeCombo = QtWidgets.QComboBox()
+        self.rightClickModeCombo.addItem("Hold", "hold")
+        self.rightClickModeCombo.addItem("Toggle", "toggle")
+        self.rightClickModeCombo.setCurrentIndex(
+            max(0, self.rightClickModeCombo.findData(settings["right_click_mode"])))
+        layout.addRow("Right click mode:", self.rightClickModeCombo)
+        self.hideDelaySpinBox = QtWidgets.QSpinBox()
+        self.hideDelaySpinBox.setRange(*setting_range("hide_delay_ms"))
+        self.hideDelaySpinBox.setValue(settings["hide_delay_ms"])
+        layout.addRow("Hide delay (ms):", self.hideDelaySpinBox)
 
         # Use color overlay checkbox
         self.useColorOverlayCheck = QtWidgets.QCheckBox("Use color overlay for PNG")
-        self.useColorOverlayCheck.setChecked(settings.get("use_color_overlay", True))
+        self.useColorOverlayCheck.setChecked(settings["use_color_overlay"])
         layout.addRow(self.useColorOverlayCheck)
 
         # Profile selection
-        self.profiles = load_profiles()
         self.profileCombo = QtWidgets.QComboBox()
-        self.profileCombo.addItems(self.profiles.keys())
-        self.profileCombo.setCurrentText(settings.get("profile", "Default"))
+        self.profileCombo.addItems(profile_store.names())
+        self.profileCombo.setCurrentText(settings["profile"])
         layout.addRow("Profile:", self.profileCombo)
 
         self.saveProfileBtn = QtWidgets.QPushButton("Save as Profile")
@@ -124,7 +1640,7 @@ class SettingsDialog(QtWidgets.QDialog):
         self.deleteProfileBtn.clicked.connect(self.delete_profile)
 
         # Select PNG button
-        self.pngPath = settings.get("crosshair", "crosshair.png")
+        self.pngPath = settings["crosshair"]
         self.pngLabel = QtWidgets.QLabel(os.path.basename(self.pngPath))
         self.selectPngBtn = QtWidgets.QPushButton("Select PNG")
         self.selectPngBtn.clicked.connect(self.select_png)
@@ -133,24 +1649,66 @@ class SettingsDialog(QtWidgets.QDialog):
         pngLayout.addWidget(self.pngLabel)
         layout.addRow("Crosshair PNG:", pngLayout)
 
+        # Procedural crosshair
+        self.shapeCombo = QtWidgets.QComboBox()
+        self.shapeCombo.addItem("PNG image", "png")
+        self.shapeCombo.addItem("Vector", "vector")
+        self.shapeCombo.addItem("Drawn", "drawn")
+        self.shapeCombo.setCurrentIndex(max(0, self.shapeCombo.findData(settings["shape"])))
+        self.drawBtn = QtWidgets.QPushButton("Draw...")
+        self.drawBtn.clicked.connect(self.open_draw_dialog)
+        shapeLayout = QtWidgets.QHBoxLayout()
+        shapeLayout.addWidget(self.shapeCombo)
+        shapeLayout.addWidget(self.drawBtn)
+        layout.addRow("Shape:", shapeLayout)
+        self.vectorBox = QtWidgets.QGroupBox("Vector crosshair")
+        vectorLayout = QtWidgets.QFormLayout(self.vectorBox)
+        self.vectorSpins = {}
+        for key, label in (("arm_length", "Arm length:"), ("gap", "Gap:"), ("thickness", "Thickness:"),
+                           ("outline", "Outline:"), ("circle", "Circle radius:")):
+            spin = QtWidgets.QSpinBox()
+            spin.setRange(*VECTOR_FIELDS[key].range)
+            vectorLayout.addRow(label, spin)
+            self.vectorSpins[key] = spin
+        self.vectorDotCheck = QtWidgets.QCheckBox("Center dot")
+        self.vectorTCheck = QtWidgets.QCheckBox("T-shape")
+        vectorLayout.addRow(self.vectorDotCheck)
+        vectorLayout.addRow(self.vectorTCheck)
+        layout.addRow(self.vectorBox)
+        self.set_vector_widgets(settings["vector"])
+
+        # Animation
+        self.animationCombo = QtWidgets.QComboBox()
+        for text, mode in (("None", "none"), ("Animated file (GIF/APNG)", "file"), ("Pulse", "pulse"), ("Spin", "spin")):
+            self.animationCombo.addItem(text, mode)
+        self.animationCombo.setCurrentIndex(max(0, self.animationCombo.findData(settings["animation"])))
+        self.fpsSpinBox = QtWidgets.QSpinBox()
+        self.fpsSpinBox.setRange(*setting_range("animation_fps"))
+        self.fpsSpinBox.setValue(settings["animation_fps"])
+        animationLayout = QtWidgets.QHBoxLayout()
+        animationLayout.addWidget(self.animationCombo)
+        animationLayout.addWidget(QtWidgets.QLabel("FPS:"))
+        animationLayout.addWidget(self.fpsSpinBox)
+        layout.addRow("Animation:", animationLayout)
+
         # Color picker
+        self.colorName = settings["color"]
         self.colorBtn = QtWidgets.QPushButton()
-        self.colorBtn.setStyleSheet(f"background-color: {settings.get('color', '#FF0000')}")
+        self.colorBtn.setStyleSheet(f"background-color: {settings['color']}")
         self.colorBtn.clicked.connect(self.pick_color)
         layout.addRow("Crosshair Color:", self.colorBtn)
 
         # Monitor selection
         self.monitorCombo = QtWidgets.QComboBox()
-        screens = QtWidgets.QApplication.screens()
-        for i, screen in enumerate(screens):
-            self.monitorCombo.addItem(f"Monitor {i+1}")
-        self.monitorCombo.setCurrentIndex(settings.get("monitor_index", 0))
+        self.refresh_monitors()
+        self.monitorCombo.setCurrentIndex(settings["monitor_index"])
         layout.addRow("Monitor:", self.monitorCombo)
+        self.crosshair.screen_index.changed.connect(self.refresh_monitors)
 
         # Opacity slider
         self.opacitySlider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
-        self.opacitySlider.setRange(10, 100)
-        self.opacitySlider.setValue(int(settings.get("opacity", 1.0) * 100))
+        self.opacitySlider.setRange(*(round(value * 100) for value in setting_range("opacity")))
+        self.opacitySlider.setValue(int(settings["opacity"] * 100))
         self.opacityLabel = QtWidgets.QLabel(str(self.opacitySlider.value()))
         opacityLayout = QtWidgets.QHBoxLayout()
         opacityLayout.addWidget(self.opacitySlider)
@@ -160,17 +1718,56 @@ class SettingsDialog(QtWidgets.QDialog):
 
         # Takip hızı spinbox
         self.timerSpinBox = QtWidgets.QSpinBox()
-        self.timerSpinBox.setRange(1, 100)
-        self.timerSpinBox.setValue(settings.get("timer_interval", 10))
+        self.timerSpinBox.setRange(*setting_range("timer_interval"))
+        self.timerSpinBox.setValue(settings["timer_interval"])
         layout.addRow("Follow time (ms):", self.timerSpinBox)
+        self.predictSpinBox = QtWidgets.QSpinBox()
+        self.predictSpinBox.setRange(*setting_range("predict_ms"))
+        self.predictSpinBox.setSpecialValueText("Off")
+        self.predictSpinBox.setValue(settings["predict_ms"])
+        layout.addRow("Predict ahead (ms):", self.predictSpinBox)
+
+        self.cacheLabel = QtWidgets.QLabel(format_cache_stats(render_cache.stats()))
+        layout.addRow("Render cache:", self.cacheLabel)
+        self.pipelineLabel = QtWidgets.QLabel(format_pipeline_stats(crosshair.pipeline_stats))
+        layout.addRow("Update stages run:", self.pipelineLabel)
+        self.animationLabel = QtWidgets.QLabel(crosshair.animation_stats())
+        layout.addRow("Animation cost:", self.animationLabel)
+        self.clickLabel = QtWidgets.QLabel(crosshair.click_filter.stats())
+        layout.addRow("Right clicks:", self.clickLabel)
+        self.repaintLabel = QtWidgets.QLabel(crosshair.repaint_stats())
+        layout.addRow("Overlay repaints:", self.repaintLabel)
+        self.predictLabel = QtWidgets.QLabel(crosshair.predictor.stats())
+        layout.addRow("Follow error:", self.predictLabel)
+        self.hotkeyLabel = QtWidgets.QLabel(crosshair.hotkeys.stats())
+        layout.addRow("Hotkey latency:", self.hotkeyLabel)
 
         self.offsetBtn = QtWidgets.QPushButton("Set Crosshair Position")
         self.offsetBtn.clicked.connect(self.open_offset_dialog)
         layout.addRow(self.offsetBtn)
 
+        self.telemetryCheck = QtWidgets.QCheckBox("Record timings")
+        self.telemetryCheck.setChecked(settings["telemetry"])
+        self.statsBtn = QtWidgets.QPushButton("Stats")
+        self.statsBtn.clicked.connect(self.open_stats_dialog)
+        telemetryLayout = QtWidgets.QHBoxLayout()
+        telemetryLayout.addWidget(self.telemetryCheck)
+        telemetryLayout.addWidget(self.statsBtn)
+        layout.addRow("Telemetry:", telemetryLayout)
+        self.telemetryCheck.stateChanged.connect(self.live_update)
+
         self.sizeSlider.valueChanged.connect(self.live_update)
         self.stepSpinBox.valueChanged.connect(self.live_update)
+        self.shapeCombo.currentIndexChanged.connect(self.live_update)
+        for spin in self.vectorSpins.values():
+            spin.valueChanged.connect(self.live_update)
+        self.vectorDotCheck.stateChanged.connect(self.live_update)
+        self.vectorTCheck.stateChanged.connect(self.live_update)
+        self.animationCombo.currentIndexChanged.connect(self.live_update)
+        self.fpsSpinBox.valueChanged.connect(self.live_update)
         self.hideRightClickCheck.stateChanged.connect(self.live_update)
+        self.rightClickModeCombo.currentIndexChanged.connect(self.live_update)
+        self.hideDelaySpinBox.valueChanged.connect(self.live_update)
         self.useColorOverlayCheck.stateChanged.connect(self.live_update)
         self.profileCombo.currentTextChanged.connect(self.change_profile)
         self.colorBtn.clicked.connect(self.live_update)
@@ -178,6 +1775,7 @@ class SettingsDialog(QtWidgets.QDialog):
         self.monitorCombo.currentIndexChanged.connect(self.live_update)
         self.selectPngBtn.clicked.connect(self.live_update)
         self.timerSpinBox.valueChanged.connect(self.live_update)
+        self.predictSpinBox.valueChanged.connect(self.live_update)
 
         self.sizeSlider.valueChanged.connect(lambda v: self.sizeLabel.setText(str(v)))
         self.sizeSlider.installEventFilter(self)
@@ -206,43 +1804,122 @@ class SettingsDialog(QtWidgets.QDialog):
         self.live_update_enabled = True
 
         self.followMouseCheck = QtWidgets.QCheckBox("Pin crosshair to mouse")
-        self.followMouseCheck.setChecked(settings.get("follow_mouse", False))
+        self.followMouseCheck.setChecked(settings["follow_mouse"])
         layout.addRow(self.followMouseCheck)
         self.followMouseCheck.stateChanged.connect(self.live_update)
 
+        self.followEventsCheck = QtWidgets.QCheckBox("Follow mouse move events (no polling)")
+        self.followEventsCheck.setChecked(settings["follow_events"])
+        layout.addRow(self.followEventsCheck)
+        self.followEventsCheck.stateChanged.connect(self.live_update)
+
+        self.staticOverlayCheck = QtWidgets.QCheckBox("Static overlay (repaint only on changes)")
+        self.staticOverlayCheck.setChecked(settings["static_overlay"])
+        layout.addRow(self.staticOverlayCheck)
+        self.staticOverlayCheck.stateChanged.connect(self.live_update)
+
+        self.controlServerCheck = QtWidgets.QCheckBox("Control API for external tools (local socket)")
+        self.controlServerCheck.setChecked(settings["control_server"])
+        layout.addRow(self.controlServerCheck)
+        self.controlServerCheck.stateChanged.connect(self.live_update)
+        # What the widgets showed when last applied; live_update sends only differences
+        self.widget_values = self.widget_settings()
+
+    def set_vector_widgets(self, params):
+        for key, spin in self.vectorSpins.items():
+            spin.setValue(int(params[key]))
+        self.vectorDotCheck.setChecked(bool(params["dot"]))
+        self.vectorTCheck.setChecked(bool(params["t_shape"]))
+        self.update_shape_widgets()
+
+    def update_shape_widgets(self):
+        # Vector crosshairs are sized by their own parameters, not by the size slider
+        vector = self.shapeCombo.currentData() == "vector"
+        self.vectorBox.setEnabled(vector)
+        self.sizeSlider.setEnabled(not vector)
+
+    def vector_widget_params(self):
+        params = {key: spin.value() for key, spin in self.vectorSpins.items()}
+        params["dot"] = self.vectorDotCheck.isChecked()
+        params["t_shape"] = self.vectorTCheck.isChecked()
+        return params
+
+    def refresh_monitors(self):
+        current = self.monitorCombo.currentIndex()
+        self.monitorCombo.blockSignals(True)
+        self.monitorCombo.clear()
+        for i in range(self.crosshair.screen_index.count()):
+            self.monitorCombo.addItem(f"Monitor {i+1}")
+        if 0 <= current < self.monitorCombo.count():
+            self.monitorCombo.setCurrentIndex(current)
+        self.monitorCombo.blockSignals(False)
+
     def select_png(self):
-        fname, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select PNG", "", "PNG Files (*.png)")
+        fname, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select PNG", "", "Images (*.png *.gif)")
         if fname:
             self.pngPath = fname
             self.pngLabel.setText(os.path.basename(fname))
-            self.settings["crosshair"] = fname
             self.live_update()
 
+    def widget_settings(self):
+        return {
+            "size": int(self.sizeSlider.value()),
+            "step": self.stepSpinBox.value(),
+            "hide_on_right_click": self.hideRightClickCheck.isChecked(),
+            "right_click_mode": self.rightClickModeCombo.currentData(),
+            "hide_delay_ms": self.hideDelaySpinBox.value(),
+            "use_color_overlay": self.useColorOverlayCheck.isChecked(),
+            "profile": self.profileCombo.currentText(),
+            "color": self.colorName,
+            "opacity": self.opacitySlider.value() / 100.0,
+            "crosshair": self.pngPath,
+            "monitor_index": self.monitorCombo.currentIndex(),
+            "follow_mouse": self.followMouseCheck.isChecked(),
+            "timer_interval": self.timerSpinBox.value(),
+            "predict_ms": self.predictSpinBox.value(),
+            "follow_events": self.followEventsCheck.isChecked(),
+            "static_overlay": self.staticOverlayCheck.isChecked(),
+            "control_server": self.controlServerCheck.isChecked(),
+            "telemetry": self.telemetryCheck.isChecked(),
+            "shape": self.shapeCombo.currentData(),
+            "vector": self.vector_widget_params(),
+            "animation": self.animationCombo.currentData(),
+            "animation_fps": self.fpsSpinBox.value(),
+        }
+
+    def changed_widget_settings(self):
+        # Settings of the widgets the user changed since the last apply, so
+        # values the widgets cannot show are not overwritten
+        values = self.widget_settings()
+        changes = {key: value for key, value in values.items() if value != self.widget_values.get(key)}
+        self.widget_values = values
+        return changes
+
     def live_update(self, *args):
-        if not getattr(self, "live_update_enabled", True):
+        if not getattr(self, "live_update_enabled", True) or not hasattr(self, "widget_values"):
             return
-        self.settings["size"] = int(self.sizeSlider.value())
-        self.settings["step"] = self.stepSpinBox.value()
-        self.settings["hide_on_right_click"] = self.hideRightClickCheck.isChecked()
-        self.settings["use_color_overlay"] = self.useColorOverlayCheck.isChecked()
-        self.settings["profile"] = self.profileCombo.currentText()
-        self.settings["color"] = self.colorBtn.palette().button().color().name()
-        self.settings["opacity"] = self.opacitySlider.value() / 100.0
-        self.settings["crosshair"] = self.pngPath
-        self.settings["monitor_index"] = self.monitorCombo.currentIndex()
-        self.settings["follow_mouse"] = self.followMouseCheck.isChecked()
-        self.settings["timer_interval"] = self.timerSpinBox.value()
-        self.crosshair.settings.update(self.settings)
-        self.crosshair.load_crosshair()
-        self.crosshair.follow_mouse()
-        self.crosshair.update()
-        self.crosshair.set_timer_interval(self.settings["timer_interval"])
-        save_settings(self.settings)
+        self.update_shape_widgets()
+        changes = self.changed_widget_settings()
+        if changes:
+            self.apply(changes)
+
+    def apply(self, new_settings, replace=False):
+        self.crosshair.apply_settings(new_settings, replace=replace)
+        self.refresh_stats()
+
+    def refresh_stats(self):
+        self.cacheLabel.setText(format_cache_stats(render_cache.stats()))
+        self.pipelineLabel.setText(format_pipeline_stats(self.crosshair.pipeline_stats))
+        self.animationLabel.setText(self.crosshair.animation_stats())
+        self.clickLabel.setText(self.crosshair.click_filter.stats())
+        self.repaintLabel.setText(self.crosshair.repaint_stats())
+        self.predictLabel.setText(self.crosshair.predictor.stats())
+        self.hotkeyLabel.setText(self.crosshair.hotkeys.stats())
 
     def eventFilter(self, obj, event):
         if event.type() == QtCore.QEvent.KeyPress and self.followMouseCheck.isChecked():
             if event.key() in (QtCore.Qt.Key_Left, QtCore.Qt.Key_Right, QtCore.Qt.Key_Up, QtCore.Qt.Key_Down):
-                step = self.settings.get("step", 0.1)
+                step = self.settings["step"]
                 if event.key() == QtCore.Qt.Key_Left:
                     self.crosshair.move_crosshair(-step, 0)
                 elif event.key() == QtCore.Qt.Key_Right:
@@ -257,16 +1934,13 @@ class SettingsDialog(QtWidgets.QDialog):
 
     def update_size(self, value):
         self.sizeLabel.setText(str(value))
-        self.crosshair.settings["size"] = value
-        save_settings(self.crosshair.settings)
-        self.crosshair.load_crosshair()
-        self.crosshair.follow_mouse()
+        self.apply({"size": value})
 
     def pick_color(self):
-        color = QtWidgets.QColorDialog.getColor(QtGui.QColor(self.settings.get("color", "#FF0000")), self)
+        color = QtWidgets.QColorDialog.getColor(QtGui.QColor(self.settings["color"]), self)
         if color.isValid():
+            self.colorName = color.name()
             self.colorBtn.setStyleSheet(f"background-color: {color.name()}")
-            self.settings["color"] = color.name()
             self.live_update()
 
     def get_settings(self):
@@ -278,24 +1952,36 @@ class SettingsDialog(QtWidgets.QDialog):
         }
 
     def change_profile(self, profile_name):
-        if profile_name in self.profiles:
-            prof = self.profiles[profile_name]
-            self.sizeSlider.setValue(prof.get("size", 40))
-            self.hideRightClickCheck.setChecked(prof.get("hide_on_right_click", True))
-            self.useColorOverlayCheck.setChecked(prof.get("use_color_overlay", True))
-            self.colorBtn.setStyleSheet(f"background-color: {prof.get('color', '#FF0000')}")
-            self.opacitySlider.setValue(int(prof.get("opacity", 1.0) * 100))
-            self.pngPath = prof.get("crosshair", "crosshair.png")
+        prof = profile_store.get(profile_name)
+        if prof is not None:
+            # Update the widgets without triggering live_update per field
+            self.live_update_enabled = False
+            self.sizeSlider.setValue(prof["size"])
+            self.hideRightClickCheck.setChecked(prof["hide_on_right_click"])
+            self.rightClickModeCombo.setCurrentIndex(
+                max(0, self.rightClickModeCombo.findData(prof["right_click_mode"])))
+            self.hideDelaySpinBox.setValue(prof["hide_delay_ms"])
+            self.useColorOverlayCheck.setChecked(prof["use_color_overlay"])
+            self.colorName = prof["color"]
+            self.colorBtn.setStyleSheet(f"background-color: {self.colorName}")
+            self.opacitySlider.setValue(int(prof["opacity"] * 100))
+            self.pngPath = prof["crosshair"]
             self.pngLabel.setText(os.path.basename(self.pngPath))
-            self.monitorCombo.setCurrentIndex(prof.get("monitor_index", 0))
-            self.settings.update(prof)
-            self.live_update()
+            self.monitorCombo.setCurrentIndex(prof["monitor_index"])
+            self.shapeCombo.setCurrentIndex(max(0, self.shapeCombo.findData(prof["shape"])))
+            self.set_vector_widgets(prof["vector"])
+            self.animationCombo.setCurrentIndex(max(0, self.animationCombo.findData(prof["animation"])))
+            self.fpsSpinBox.setValue(prof["animation_fps"])
+            self.live_update_enabled = True
+            self.widget_values = self.widget_settings()  # The widgets now show the profile
+            self.apply(profile_changes(profile_name, prof))
+            profile_store.touch(profile_name)
+            self.crosshair.prewarm_profiles()
 
     def save_profile(self):
         name, ok = QtWidgets.QInputDialog.getText(self, "Save Profile", "Profile name:")
         if ok and name:
-            self.profiles[name] = self.get_settings()
-            save_profiles(self.profiles)
+            profile_store.put(name, profile_data(self.get_settings()))
             if self.profileCombo.findText(name) == -1:
                 self.profileCombo.addItem(name)
             self.profileCombo.setCurrentText(name)
@@ -307,43 +1993,62 @@ class SettingsDialog(QtWidgets.QDialog):
             return
         reply = QtWidgets.QMessageBox.question(self, "Delete Profile", f"Delete profile '{name}'?", QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
         if reply == QtWidgets.QMessageBox.Yes:
-            self.profiles.pop(name, None)
-            save_profiles(self.profiles)
+            profile_store.delete(name)
             self.profileCombo.removeItem(self.profileCombo.currentIndex())
             self.profileCombo.setCurrentText("Default")
             self.change_profile("Default")
 
     def open_offset_dialog(self):
         dlg = OffsetAdjustDialog(
-            self.settings.get("x", 0),
-            self.settings.get("y", 0),
+            self.settings["x"],
+            self.settings["y"],
             self.followMouseCheck.isChecked(),
             self.crosshair,
             self,
         )
         if dlg.exec_() == QtWidgets.QDialog.Accepted:
             x, y = dlg.get_offsets()
-            self.settings["x"] = float(x)
-            self.settings["y"] = float(y)
-            self.live_update()
+            self.apply({"x": float(x), "y": float(y)})
+
+    def open_draw_dialog(self):
+        dlg = CrosshairDrawDialog(self.settings, self)
+        if dlg.exec_() == QtWidgets.QDialog.Accepted:
+            self.live_update_enabled = False
+            self.shapeCombo.setCurrentIndex(self.shapeCombo.findData("drawn"))
+            self.live_update_enabled = True
+            self.apply({**self.changed_widget_settings(), "drawing": dlg.get_drawing()})
+
+    def open_stats_dialog(self):
+        TelemetryDialog(self).exec_()
 
     def reject(self):
-        self.settings.clear()
-        self.settings.update(self.old_settings)
-        self.crosshair.settings.clear()
-        self.crosshair.settings.update(self.old_settings)
-        self.crosshair.load_crosshair()
-        self.crosshair.follow_mouse()
-        self.crosshair.update()
+        self.apply(self.old_settings, replace=True)
         super().reject()
 
     def exit_app(self):
         QtWidgets.QApplication.quit()
 
 class Crosshair(QtWidgets.QWidget):
-    def __init__(self):
+    prewarm_rendered = QtCore.pyqtSignal(object, object)
+    render_finished = QtCore.pyqtSignal(object, int, object, object, object, object, object)
+    # Cursor and clock of the follow loop; replay.py swaps in a recorded trace
+    cursor_pos = staticmethod(QtGui.QCursor.pos)
+    clock = staticmethod(time.perf_counter)
+
+    def __init__(self, host=None, settings=None):
+        # host is None for the main overlay. Extra overlays (see sync_overlays)
+        # get their settings from it and share its screen index, mouse
+        # listener, hotkeys and follow timer.
         super().__init__()
-        self.settings = load_settings()
+        self.host = host
+        self.overlays = []
+        self.settings = load_settings() if host is None else settings
+        startup_profile.mark("settings")
+        self.pipeline_stats = dict.fromkeys(("calls",) + UPDATE_STAGES, 0)
+        self.unsaved_settings = False
+        if host is None:
+            telemetry.enabled = self.settings["telemetry"]
+            render_cache.set_budget(self.settings["render_cache_mb"] * 1024 * 1024)
         self.setWindowFlags(
             QtCore.Qt.FramelessWindowHint |
             QtCore.Qt.WindowStaysOnTopHint |
@@ -352,143 +2057,602 @@ class Crosshair(QtWidgets.QWidget):
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground)
         self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
         self.make_clickthrough()
+        self.screen_index = ScreenIndex(self) if host is None else host.screen_index
+        self.screen_index.changed.connect(self.on_screens_changed)
+        self.refresh_view()
+        self.prewarm_rendered.connect(self.on_prewarm_rendered)
+        # Renders run on the global pool like PrewarmTask: Qt's image conversion
+        # waits on that pool when called from any other thread
+        self.render_request = 0
+        self.render_started = 0.0
+        self.render_finished.connect(self.on_render_finished)
+        self.crosshair = QtGui.QPixmap()  # Empty until the first render is in
+        self.atlas = None
+        self.frame_index = 0
+        self.render_key = None
+        self.phase = (0, 0)
+        self.phased = None
+        self.content_size = QtCore.QSize(40, 40)
+        self.resize(self.content_size)
+        self.painted = False
+        self.tracking_screen = False  # windowHandle().screenChanged is connected
+        self.content_dirty = True
+        self.repaints = 0
+        self.clean_repaints = 0  # Repaints Qt asked for without a content change
+        self.saved_render_key = None
+        self.frame_timer = QtCore.QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.timeout.connect(self.advance_frame)
+        startup_profile.mark("window")
         self.load_crosshair()
-        self.resize(self.crosshair.size())
+        self.follow_mouse()
+        self.visible_state = True
+        if host is not None:
+            return
+        # Only used to poll the cursor when following without move events
         self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self.follow_mouse)
-        self.timer.start(self.settings.get("timer_interval", 10))  # Default 10 ms
+        self.timer.timeout.connect(self.poll_tick)
+        self.last_tick = None
+        self.timer.setInterval(self.settings["timer_interval"])  # Default 10 ms
+        self.update_follow_timer()
+        self.predictor = CursorPredictor(self.settings["predict_ms"])
+        # Re-reads the cursor after a predicted move so the overlay snaps back
+        # when the cursor stops (no more move events arrive then)
+        self.snap_timer = QtCore.QTimer(self)
+        self.snap_timer.setSingleShot(True)
+        self.snap_timer.timeout.connect(self.follow_all)
         self.installEventFilter(self)
-        self.visible_state = True
         self.settings_open = False
+        self.move_pending = False
+        self.move_event_at = 0.0
+        self.click_filter = RightClickFilter(self)
+        self.click_filter.configure(self.settings)
+        self.hide_timer = QtCore.QTimer(self)
+        self.hide_timer.setSingleShot(True)
+        self.hide_timer.timeout.connect(self.hide_crosshair_temp)
+        self.mouse_listener = None
+        self.control_server = None
+        startup_profile.mark("render")
+
+        self.hotkey_actions = {
+            "open_settings": self.open_settings,
+            "toggle_visibility": self.toggle_visibility,
+            "profile_next": lambda: self.cycle_profile(1),
+            "profile_prev": lambda: self.cycle_profile(-1),
+            "nudge_left": lambda: self.nudge(-1, 0),
+            "nudge_right": lambda: self.nudge(1, 0),
+            "nudge_up": lambda: self.nudge(0, -1),
+            "nudge_down": lambda: self.nudge(0, 1),
+        }
+        self.hotkeys = HotkeyDispatcher(self, self.settings["hotkeys"])
+        # Listener, hotkeys and tray icon are set up by finish_startup after the first paint
+        self.sync_overlays()
+
+    def windows(self):
+        return [self] + self.overlays
+
+    def sync_overlays(self):
+        # One extra window per entry of settings["overlays"], updated in place
+        specs = self.settings["overlays"]
+        while len(self.overlays) > len(specs):
+            overlay = self.overlays.pop()
+            overlay.cancel_render()  # A render still running reports to on_render_finished, which drops it
+            overlay.hide()
+            overlay.deleteLater()
+        for i, spec in enumerate(specs):
+            settings = overlay_settings(spec, self.settings)
+            if i < len(self.overlays):
+                self.overlays[i].apply_settings(settings, replace=True, persist=False)
+            else:
+                overlay = Crosshair(self, settings)
+                self.overlays.append(overlay)
+                if self.visible_state:
+                    overlay.show()
+        self.update_follow_timer()
 
-        # Start mouse listener only here
-        self.mouse_listener = mouse.Listener(on_click=self.on_click)
+    @QtCore.pyqtSlot()
+    def finish_startup(self):
+        self.start_mouse_listener()
+        startup_profile.mark("mouse listener")
+        self.start_hotkeys()
+        startup_profile.mark("hotkeys")
+        self.create_tray_icon()
+        startup_profile.mark("tray icon")
+        self.update_control_server()
+        if startup_profile.enabled:
+            startup_profile.report()
+
+    def start_mouse_listener(self):
+        from pynput import mouse
+        self.click_filter.button = mouse.Button.right
+        self.mouse_listener = mouse.Listener(on_click=self.on_click, on_move=self.on_move)
         self.mouse_listener.daemon = True
         self.mouse_listener.start()
 
-        self.start_hotkey_threads()
-        self.create_tray_icon()
-
     def on_click(self, x, y, button, pressed):
-        if button == mouse.Button.right and self.settings.get("hide_on_right_click", True):
-            if pressed:
-                QtCore.QMetaObject.invokeMethod(self, "hide_crosshair_temp", QtCore.Qt.QueuedConnection)
-            else:
-                QtCore.QMetaObject.invokeMethod(self, "show_crosshair_temp", QtCore.Qt.QueuedConnection)
+        self.click_filter.on_click(button, pressed)
+
+    @QtCore.pyqtSlot()
+    def apply_click_state(self):
+        self.click_filter.queued = False
+        if not self.click_filter.hidden:
+            self.hide_timer.stop()
+            self.show_crosshair_temp()
+            return
+        delay = self.settings["hide_delay_ms"]
+        if delay <= 0:
+            self.hide_crosshair_temp()
+        elif not self.hide_timer.isActive():
+            self.hide_timer.start(delay)
+
+    def on_move(self, x, y):
+        # Called on the listener thread. At most one follow_cursor call is
+        # queued at a time; it reads the newest position when it runs.
+        if self.move_pending or not self.following:
+            return
+        if not self.view.follow_events:
+            return
+        self.move_event_at = time.perf_counter()
+        self.move_pending = True
+        QtCore.QMetaObject.invokeMethod(self, "follow_cursor", QtCore.Qt.QueuedConnection)
+
+    @QtCore.pyqtSlot()
+    def follow_cursor(self):
+        self.move_pending = False
+        self.follow_all()
+        if telemetry.enabled:
+            telemetry.record("move_latency", (time.perf_counter() - self.move_event_at) * 1000)
+
+    def poll_tick(self):
+        if telemetry.enabled:
+            now = time.perf_counter()
+            if self.last_tick is not None:
+                telemetry.record("tick_jitter", abs((now - self.last_tick) * 1000 - self.timer.interval()))
+            self.last_tick = now
+        self.follow_all()
+
+    def follow_all(self):
+        # The one follow pass for every window, with a single cursor read
+        pos = self.cursor_pos()
+        if self.predictor.horizon:
+            x, y = self.predictor.predict(pos.x(), pos.y(), self.clock())
+            if (x, y) != (pos.x(), pos.y()):
+                pos = QtCore.QPoint(round(x), round(y))
+                self.snap_timer.start(max(2 * self.settings["predict_ms"], self.settings["timer_interval"]))
+        for window in self.windows():
+            if window.view.follow_mouse:
+                window.follow_mouse(pos)
 
     @QtCore.pyqtSlot()
     def hide_crosshair_temp(self):
         if self.isVisible() and self.visible_state:
-            self.hide()
+            for window in self.windows():
+                window.hide()
+            if telemetry.enabled:
+                telemetry.record("hide_latency", (time.perf_counter() - self.click_filter.changed_at) * 1000)
 
     @QtCore.pyqtSlot()
     def show_crosshair_temp(self):
         if not self.isVisible() and self.visible_state:
-            self.show()
+            for window in self.windows():
+                window.show()
 
     def make_clickthrough(self):
+        import ctypes
         hwnd = int(self.winId())
         extended_style = ctypes.windll.user32.GetWindowLongW(hwnd, -20)
         ctypes.windll.user32.SetWindowLongW(hwnd, -20, extended_style | 0x80000 | 0x20)
 
     def load_crosshair(self):
+        # Cached and vector crosshairs are swapped in right away, PNG renders
+        # go to the render pool and the current pixmap stays up until they finish
+        started = time.perf_counter()
+        self.cancel_render()
         try:
-            crosshair_path = self.settings.get("crosshair", "crosshair.png")
-            size = int(self.settings.get("size", 40))
-            color = QtGui.QColor(self.settings.get("color", "#FF0000"))
-            opacity = float(self.settings.get("opacity", 1.0))
-            use_overlay = self.settings.get("use_color_overlay", True)
-            if os.path.exists(crosshair_path):
-                pixmap = QtGui.QPixmap(crosshair_path)
-                if pixmap.isNull():
-                    pixmap = self.draw_default_crosshair(size, color)
+            view = self.view
+            crosshair_path = view.crosshair
+            size = view.size
+            color = view.color
+            opacity = view.opacity
+            use_overlay = view.use_overlay
+            if view.shape != "png":
+                dpr = self.render_dpr()
+                if view.shape == "vector":
+                    params = self.settings["vector"]
+                    key = render_cache.vector_key(params, color, opacity, dpr)
+                    render = lambda: render_vector_image(params, color, opacity, dpr)
                 else:
-                    if use_overlay:
-                        image = pixmap.toImage().convertToFormat(QtGui.QImage.Format_ARGB32)
-                        for y in range(image.height()):
-                            for x in range(image.width()):
-                                pixel = image.pixelColor(x, y)
-                                alpha = pixel.alpha()
-                                if alpha > 0:
-                                    image.setPixelColor(x, y, QtGui.QColor(color.red(), color.green(), color.blue(), alpha))
-                        pixmap = QtGui.QPixmap.fromImage(image)
+                    drawing = self.settings["drawing"]
+                    key = render_cache.drawing_key(drawing, size, color, opacity, dpr)
+                    render = lambda: render_drawing_image(drawing, size, color, opacity, dpr)
+                pixmap = render_cache.get(key)
+                if pixmap is None:
+                    pixmap = self.startup_pixmap(key)
+                    if pixmap is None:
+                        pixmap = QtGui.QPixmap.fromImage(render())
+                    render_cache.put(key, pixmap)
             else:
-                pixmap = self.draw_default_crosshair(size, color)
-            pixmap = pixmap.scaled(size, size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-            if opacity < 1.0:
-                temp = QtGui.QPixmap(pixmap.size())
-                temp.fill(QtCore.Qt.transparent)
-                painter = QtGui.QPainter(temp)
-                painter.setOpacity(opacity)
-                painter.drawPixmap(0, 0, pixmap)
-                painter.end()
-                pixmap = temp
-            self.crosshair = pixmap
-            pixmap = self.crosshair
-            w, h = pixmap.width(), pixmap.height()
-            if w > 0 and h > 0:
-                self.resize(w, h)
-            else:
-                print("Invalid pixmap size:", w, h)
+                file_id = render_cache.file_id(crosshair_path)
+                key = render_cache.render_key(file_id, size, color, opacity, use_overlay)
+                # Frames of an animated file are decoded in the render pool too
+                animate = (self.settings["animation"] == "file" and file_id is not None
+                           and not render_cache.contains(("atlas",) + key))
+                pixmap = render_cache.get(key)
+                if pixmap is None:
+                    pixmap = self.startup_pixmap(key)
+                    if pixmap is not None:
+                        render_cache.put(key, pixmap)
+                if pixmap is None or animate:
+                    self.request_render((key, crosshair_path, file_id, size, color, opacity, use_overlay),
+                                        started, animate)
+                    if pixmap is None:
+                        return
+            self.set_crosshair(key, pixmap)
+        except Exception as e:
+            print("load_crosshair error:", e)
+            self.set_default_crosshair()
+        if telemetry.enabled:
+            telemetry.record("render", (time.perf_counter() - started) * 1000)
+
+    def set_crosshair(self, key, pixmap):
+        self.crosshair = pixmap
+        self.render_key = key
+        self.phase = (0, 0)
+        self.phased = None
+        self.load_animation(key)
+        # Window size is in logical pixels, HiDPI pixmaps are larger
+        if self.atlas is not None:
+            w, h = self.atlas.frame_size.width(), self.atlas.frame_size.height()
+        else:
+            w = round(pixmap.width() / pixmap.devicePixelRatio())
+            h = round(pixmap.height() / pixmap.devicePixelRatio())
+        if w > 0 and h > 0:
+            self.content_size = QtCore.QSize(w, h)
+            self.resize(w, h)
+        else:
+            print("Invalid pixmap size:", w, h)
+        self.mark_dirty()
+
+    def set_default_crosshair(self):
+        self.crosshair = self.draw_default_crosshair(40, QtGui.QColor("#FF0000"))
+        self.atlas = None
+        self.frame_timer.stop()
+        self.render_key = None
+        self.phase = (0, 0)
+        self.phased = None
+        self.content_size = QtCore.QSize(40, 40)
+        self.resize(40, 40)
+        self.mark_dirty()
+
+    def mark_dirty(self):
+        # The only way new content reaches the screen. In static mode the
+        # window is shaped to the crosshair and repainted only from here.
+        self.content_dirty = True
+        if self.settings["static_overlay"] and self.atlas is None and not self.crosshair.isNull():
+            self.setMask(alpha_region(self.phased if self.phased is not None else self.crosshair))
+        else:
+            self.clearMask()
+        self.update()
+
+    def repaint_stats(self):
+        return f"{self.repaints} ({self.clean_repaints} without a content change)"
+
+    def cancel_render(self):
+        # Supersedes the pending render: a queued task returns as soon as it
+        # starts, a running one at its next check, and its result is not shown
+        self.render_request += 1
+
+    def request_render(self, job, started, animate=False):
+        key, path, file_id, size, color, opacity, use_overlay = job
+        source = levels = None
+        if file_id is not None:
+            source = render_cache.cached_source(file_id)
+            if source is not None:
+                levels = render_cache.cached_pyramid(file_id, color, use_overlay)
+        self.render_started = started
+        host = self.host or self
+        QtCore.QThreadPool.globalInstance().start(RenderTask(
+            self, self.render_request, lambda: self.render_request, job, source, levels, animate,
+            host.render_finished))
+
+    @QtCore.pyqtSlot(object, int, object, object, object, object, object)
+    def on_render_finished(self, window, request, job, image, source, levels, atlas):
+        # Every window's renders report here, on the main overlay
+        key, path, file_id, size, color, opacity, use_overlay = job
+        # Decodes are worth keeping even when the render was superseded
+        if file_id is not None and source is not None:
+            render_cache.store_source(file_id, source)
+            if levels is not None:
+                render_cache.store_pyramid(file_id, color, use_overlay, levels)
+        if window is self or window in self.overlays:  # Not removed by sync_overlays
+            window.show_render(request, key, image, atlas)
+
+    def show_render(self, request, key, image, atlas):
+        if request != self.render_request:
+            return
+        try:
+            if image is None:
+                raise ValueError("render failed")
+            pixmap = QtGui.QPixmap.fromImage(image)
+            render_cache.put(key, pixmap)
+            if atlas:
+                render_cache.put(("atlas",) + key, atlas.upload(), atlas.nbytes)
+            elif atlas is False:
+                render_cache.put(("atlas",) + key, False, 0)  # Single frame file, not decoded again
+            self.set_crosshair(key, pixmap)
         except Exception as e:
             print("load_crosshair error:", e)
-            self.crosshair = self.draw_default_crosshair(40, QtGui.QColor("#FF0000"))
-            self.resize(40, 40)
+            self.set_default_crosshair()
+        self.follow_mouse()
+        if telemetry.enabled:
+            telemetry.record("render", (time.perf_counter() - self.render_started) * 1000)
+
+    def wait_for_render(self):
+        # Blocks until a pending render has been swapped in (benchmarks)
+        QtCore.QThreadPool.globalInstance().waitForDone()
+        QtCore.QCoreApplication.sendPostedEvents(self.host or self, QtCore.QEvent.MetaCall)
+
+    def load_animation(self, static_key):
+        # Looks up or builds the frame atlas for the current animation setting.
+        # File atlases come from the render pool (see load_crosshair).
+        mode = self.settings["animation"]
+        atlas = None
+        if mode == "file" and static_key[0] == "pixmap":
+            atlas = render_cache.get(("atlas",) + static_key) or None
+        elif mode in ANIMATION_FRAMES:
+            key = ("atlas", mode) + static_key
+            atlas = render_cache.get(key)
+            if atlas is None:
+                base = self.crosshair.toImage()
+                make_frames = spin_frames if mode == "spin" else pulse_frames
+                atlas = FrameAtlas(make_frames(base, ANIMATION_FRAMES[mode])).upload()
+                render_cache.put(key, atlas, atlas.nbytes)
+        self.atlas = atlas
+        self.frame_index = 0
+        if atlas is None:
+            self.frame_timer.stop()
+        else:
+            self.start_animation()
 
-    def draw_default_crosshair(self, size, color):
-        pixmap = QtGui.QPixmap(size, size)
-        pixmap.fill(QtCore.Qt.transparent)
-        painter = QtGui.QPainter(pixmap)
-        pen = QtGui.QPen(color, 2)
-        painter.setPen(pen)
-        painter.drawLine(size//2, 0, size//2, size)
-        painter.drawLine(0, size//2, size, size//2)
-        painter.end()
+    def frame_delay(self):
+        if self.atlas.delays is not None:
+            return self.atlas.delays[self.frame_index]
+        return max(1, round(1000 / self.settings["animation_fps"]))
+
+    def start_animation(self):
+        if self.atlas is not None and self.isVisible() and not self.frame_timer.isActive():
+            self.frame_timer.start(self.frame_delay())
+
+    def advance_frame(self):
+        # Only runs while the overlay is visible; hideEvent stops the timer
+        if self.atlas is None or not self.isVisible():
+            return
+        self.frame_index = (self.frame_index + 1) % self.atlas.count
+        dirty = self.atlas.dirty[self.frame_index]
+        if not dirty.isEmpty():
+            self.update(dirty)
+        self.frame_timer.start(self.frame_delay())
+
+    def animation_stats(self):
+        if self.atlas is None:
+            return "off"
+        text = f"{self.atlas.count} frames, {self.atlas.nbytes / 1024:.0f} KB atlas"
+        paint = telemetry.summary()["animation_frame"]
+        if paint["count"]:
+            text += f", {paint['mean_ms']:.3f} ms/frame"
+        return text
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        handle = self.windowHandle()
+        if handle is not None and not self.tracking_screen:
+            handle.screenChanged.connect(self.on_window_screen_changed)
+            self.tracking_screen = True
+        self.start_animation()
+
+    def render_dpr(self):
+        # A fixed overlay is rendered for its monitor, a following one for the
+        # screen it is currently on
+        if self.view.follow_mouse:
+            handle = self.windowHandle()
+            if handle is not None and handle.screen() is not None:
+                return handle.screen().devicePixelRatio()
+        return self.screen_index.device_pixel_ratio(self.view.monitor_index)
+
+    def on_window_screen_changed(self, screen):
+        # Following the mouse onto a monitor with another device pixel ratio
+        if self.view.follow_mouse and self.view.shape != "png":
+            self.load_crosshair()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.frame_timer.stop()
+
+    def startup_pixmap(self, key):
+        # Until the first paint, reuse the pixmap saved at the last exit
+        if self.painted:
+            return None
+        try:
+            pixmap = load_last_render(key)
+        except Exception as e:
+            print("load_last_render error:", e)
+            return None
+        if pixmap is not None:
+            self.saved_render_key = key
         return pixmap
 
-    def follow_mouse(self):
-        if self.settings.get("follow_mouse", False):
-            pos = QtGui.QCursor.pos()
-            x_offset = self.settings.get("x", 0)
-            y_offset = self.settings.get("y", 0)
-            w = self.width()
-            h = self.height()
-            self.move(
-                int(pos.x() + x_offset - w / 2),
-                int(pos.y() + y_offset - h / 2)
+    def save_last_render(self):
+        if self.render_key is None or self.render_key == self.saved_render_key:
+            return
+        try:
+            save_last_render(self.crosshair, self.render_key)
+            self.saved_render_key = self.render_key
+        except Exception as e:
+            print("save_last_render error:", e)
+
+    def draw_default_crosshair(self, size, color):
+        return QtGui.QPixmap.fromImage(draw_default_crosshair_image(size, color))
+
+    def prewarm_profiles(self):
+        # Render the most recently used profiles in the background so
+        # switching to them is a cache hit
+        jobs = []
+        for name, prof in profile_store.recent(self.settings["prewarm_profiles"]):
+            if prof["shape"] != "png":
+                continue  # Cheap to draw, nothing to decode
+            path = prof["crosshair"]
+            size = prof["size"]
+            color = QtGui.QColor(prof["color"])
+            opacity = prof["opacity"]
+            use_overlay = prof["use_color_overlay"]
+            key = render_cache.render_key(render_cache.file_id(path), size, color, opacity, use_overlay)
+            if not render_cache.contains(key):
+                jobs.append((key, path, size, color, opacity, use_overlay))
+        if jobs:
+            QtCore.QThreadPool.globalInstance().start(PrewarmTask(jobs, self.prewarm_rendered))
+
+    def on_prewarm_rendered(self, key, image):
+        if not render_cache.contains(key):
+            render_cache.put(key, QtGui.QPixmap.fromImage(image))
+
+    def follow_mouse(self, pos=None):
+        # Whole pixels of the offsets move the window, the fraction picks a
+        # phase-shifted pixmap
+        view = self.view
+        w, h = self.content_size.width(), self.content_size.height()
+        if view.follow_mouse:
+            if pos is None:
+                pos = self.cursor_pos()
+            self.set_phase(view.x_phase, view.y_phase)
+            self.move_if_changed(
+                int(pos.x() + view.x_offset - w / 2),
+                int(pos.y() + view.y_offset - h / 2)
             )
             return
-        screens = QtWidgets.QApplication.screens()
-        monitor_index = self.settings.get("monitor_index", 0)
-        if monitor_index >= len(screens):
-            monitor_index = 0
-        screen = screens[monitor_index].geometry()
-        x_offset = int(self.settings.get("x") or 0)
-        y_offset = int(self.settings.get("y") or 0)
-        w, h = self.width(), self.height()
         if w <= 0 or h <= 0:
             w, h = 40, 40
-        center_x = screen.center().x() - w // 2 + x_offset
-        center_y = screen.center().y() - h // 2 + y_offset
+        target = self.screen_index.fixed_target(view.monitor_index, w, h, view.x_offset, view.y_offset)
+        if target is not None:
+            self.set_phase(view.x_phase, view.y_phase)
+            self.move_if_changed(*target)
 
-        min_x = screen.left()
-        max_x = screen.right() - w
-        min_y = screen.top()
-        max_y = screen.bottom() - h
-        center_x = max(min_x, min(center_x, max_x))
-        center_y = max(min_y, min(center_y, max_y))
+    def set_phase(self, x_phase, y_phase):
+        if (x_phase, y_phase) == self.phase:
+            return
+        self.phase = (x_phase, y_phase)
+        size = self.content_size
+        if self.atlas is not None or self.phase == (0, 0) or self.render_key is None:
+            self.phased = None
+        else:
+            key = ("phase", self.render_key, x_phase, y_phase)
+            pixmap = render_cache.get(key)
+            if pixmap is None:
+                pixmap = QtGui.QPixmap.fromImage(phase_shifted_image(
+                    self.crosshair.toImage(), x_phase / SUBPIXEL_PHASES, y_phase / SUBPIXEL_PHASES))
+                render_cache.put(key, pixmap)
+            self.phased = pixmap
+            size = size + QtCore.QSize(1, 1)
+        if self.size() != size:
+            self.resize(size)
+        self.mark_dirty()
+
+    def on_screens_changed(self):
+        # A monitor's device pixel ratio may have changed, vector and drawn shapes depend on it
+        self.refresh_view()
+        if self.view.shape != "png":
+            self.load_crosshair()
+        self.follow_mouse()
+
+    def refresh_view(self):
+        self.view = SettingsView(self.settings, self.screen_index.count())
 
-        self.move(center_x, center_y)
+    def move_if_changed(self, x, y):
+        if x != self.x() or y != self.y():
+            self.move(x, y)
 
     def move_crosshair(self, dx, dy):
-        self.settings["x"] = self.settings.get("x", 0) + dx
-        self.settings["y"] = self.settings.get("y", 0) + dy
-        save_settings(self.settings)
-        self.follow_mouse()
+        self.apply_settings({
+            "x": self.settings["x"] + dx,
+            "y": self.settings["y"] + dy,
+        })
+
+    def apply_settings(self, new_settings, replace=False, persist=True):
+        # Diff against the current settings and run only the stages that the
+        # changed fields depend on. replace=True also drops keys not in new_settings.
+        if replace:
+            new_settings = normalize_settings(new_settings)
+        else:
+            new_settings = {key: check_setting(key, value, self.settings.get(key))
+                            for key, value in new_settings.items()}
+        changed = {key for key, value in new_settings.items() if self.settings.get(key, object()) != value}
+        if replace:
+            changed |= self.settings.keys() - new_settings.keys()
+            self.settings.clear()
+        self.settings.update(new_settings)
+        if changed:
+            self.refresh_view()
+        stats = self.pipeline_stats
+        stats["calls"] += 1
+        if changed & RENDER_FIELDS or ("follow_mouse" in changed and self.view.shape != "png"):
+            # Turning follow mode on or off also changes where vector/drawn shapes take their DPR from
+            stats["render"] += 1
+            self.load_crosshair()
+        elif "static_overlay" in changed:
+            self.mark_dirty()
+        if changed & (RENDER_FIELDS | POSITION_FIELDS):
+            stats["reposition"] += 1
+            self.follow_mouse()
+        if self.host is not None:
+            return changed  # Timers, hooks and settings.json belong to the main overlay
+        if changed & TIMER_FIELDS:
+            stats["timer"] += 1
+            self.set_timer_interval(self.settings["timer_interval"])
+        if changed & {"predict_ms", "follow_mouse"}:
+            self.predictor.configure(self.settings["predict_ms"])
+            self.snap_timer.stop()
+        if changed & {"hide_on_right_click", "right_click_mode"}:
+            self.click_filter.configure(self.settings)
+            self.hide_timer.stop()
+            self.show_crosshair_temp()
+        if changed and (self.overlays or self.settings["overlays"]):
+            self.sync_overlays()
+        if "hotkeys" in changed:
+            self.hotkeys.set_keymap(self.settings["hotkeys"])
+        if "render_cache_mb" in changed:
+            render_cache.set_budget(self.settings["render_cache_mb"] * 1024 * 1024)
+        if "telemetry" in changed:
+            telemetry.enabled = self.settings["telemetry"]
+            self.last_tick = None
+        if "control_server" in changed and self.painted:
+            self.update_control_server()  # Otherwise finish_startup starts it
+        if changed and not persist:
+            self.unsaved_settings = True
+        elif persist and (changed or self.unsaved_settings):
+            stats["persist"] += 1
+            save_settings(self.settings)
+            self.unsaved_settings = False
+        return changed
 
     def paintEvent(self, event):
+        if not self.painted:
+            self.painted = True
+            if self.host is None:
+                startup_profile.mark("first paint")
+                QtCore.QTimer.singleShot(0, self.finish_startup)
+        self.repaints += 1
+        if not self.content_dirty and self.atlas is None:
+            self.clean_repaints += 1
+        self.content_dirty = False
         painter = QtGui.QPainter(self)
-        painter.drawPixmap(0, 0, self.crosshair)
+        if self.atlas is not None:
+            started = time.perf_counter()
+            size = self.atlas.frame_size
+            painter.drawPixmap(QtCore.QRectF(0, 0, size.width(), size.height()), self.atlas.pixmap,
+                               QtCore.QRectF(self.atlas.sources[self.frame_index]))
+            if telemetry.enabled:
+                telemetry.record("animation_frame", (time.perf_counter() - started) * 1000)
+            return
+        painter.drawPixmap(0, 0, self.phased if self.phased is not None else self.crosshair)
 
     @QtCore.pyqtSlot()
     def open_settings(self):
@@ -496,19 +2660,15 @@ class Crosshair(QtWidgets.QWidget):
             return  # Prevent opening multiple dialogs
         self.settings_open = True
         old_settings = self.settings.copy()
+        self.prewarm_profiles()
         dialog = SettingsDialog(self.settings, self, None)
         dialog.setWindowFlags(QtCore.Qt.Window)
         result = dialog.exec_()
         self.settings_open = False  # Reset flag when dialog closes
         if result:
-            self.settings.update(dialog.get_settings())
-            save_settings(self.settings)
-            self.load_crosshair()
+            self.apply_settings(dialog.get_settings())
         else:
-            self.settings = old_settings
-            save_settings(self.settings)
-            self.load_crosshair()
-            self.follow_mouse()
+            self.apply_settings(old_settings, replace=True)
 
     def closeEvent(self, event):
         event.ignore()
@@ -527,59 +2687,288 @@ class Crosshair(QtWidgets.QWidget):
         exit_action.triggered.connect(QtWidgets.QApplication.quit)
         self.tray.setContextMenu(menu)
 
-    def start_hotkey_threads(self):
-        def listen_f2():
-            while True:
-                keyboard.wait("f2")
-                QtCore.QMetaObject.invokeMethod(self, "open_settings", QtCore.Qt.QueuedConnection)
+    def start_hotkeys(self):
+        self.hotkeys.start()
 
-        def listen_f3():
-            while True:
-                keyboard.wait("f3")
-                QtCore.QMetaObject.invokeMethod(self, "toggle_visibility", QtCore.Qt.QueuedConnection)
+    @QtCore.pyqtSlot(str, float)
+    def run_hotkey(self, action, pressed_at):
+        self.hotkeys.record_latency(pressed_at)
+        handler = self.hotkey_actions.get(action)
+        if handler is not None:
+            handler()
 
-        threading.Thread(target=listen_f2, daemon=True).start()
-        threading.Thread(target=listen_f3, daemon=True).start()
+    def nudge(self, dx, dy):
+        step = self.settings["step"]
+        self.move_crosshair(dx * step, dy * step)
+
+    def cycle_profile(self, direction):
+        if self.settings_open:
+            return  # The settings dialog owns the profile while it is open
+        names = profile_store.names()
+        if not names:
+            return
+        current = self.settings["profile"]
+        index = names.index(current) if current in names else -1
+        name = names[(index + direction) % len(names)]
+        self.apply_settings(profile_changes(name, profile_store.get(name)))
+        profile_store.touch(name)
+        self.prewarm_profiles()
 
     @QtCore.pyqtSlot()
     def toggle_visibility(self):
-        if self.visible_state:
-            self.hide()
-        else:
-            self.show()
-        self.visible_state = not self.visible_state
+        self.set_visible(not self.visible_state)
+
+    def set_visible(self, visible):
+        for window in self.windows():
+            window.setVisible(visible)
+            window.visible_state = visible
+
+    def update_control_server(self):
+        if self.settings["control_server"]:
+            if self.control_server is None:
+                self.control_server = ControlServer(self)
+            self.control_server.start()
+        elif self.control_server is not None:
+            self.control_server.stop()
+
+    def run_commands(self, commands):
+        # A control API batch (see parse_commands) as one apply_settings call.
+        # The whole batch is checked first; a bad command changes nothing.
+        changes = {}
+        profile = None
+        visible = self.visible_state
+        keys = []
+        current = lambda key: changes.get(key, self.settings[key])
+        for name, args in commands:
+            if name == "profile":
+                prof = profile_store.get(args)
+                if prof is None:
+                    raise ValueError(f"no profile {args!r}")
+                changes.update(profile_changes(args, prof))
+                profile = args
+            elif name == "set":
+                key, value = args
+                if key not in SETTINGS_SCHEMA:
+                    raise ValueError(f"unknown setting {key!r}")
+                if key == "profile":
+                    raise ValueError("use the profile command to load a profile")
+                try:
+                    # Nested values (hotkeys, overlays, vector, drawing) are checked here too
+                    changes[key] = SETTINGS_SCHEMA[key][1](value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"invalid value for {key}: {value!r}") from None
+            elif name in ("nudge", "move"):
+                step = current("step") if name == "nudge" else 1
+                changes["x"] = current("x") + args[0] * step
+                changes["y"] = current("y") + args[1] * step
+            elif name in ("show", "hide", "toggle"):
+                visible = {"show": True, "hide": False}.get(name, not visible)
+            elif name == "get":
+                if args != "visible" and args not in SETTINGS_SCHEMA:
+                    raise ValueError(f"unknown setting {args!r}")
+                keys.append(args)
+        if changes:
+            if self.settings_open:
+                raise ValueError("the settings window is open")
+            self.apply_settings(changes)
+        if profile is not None:
+            profile_store.touch(profile)
+            self.prewarm_profiles()
+        if visible != self.visible_state:
+            self.set_visible(visible)
+        return {key: self.visible_state if key == "visible" else self.settings[key] for key in keys}
 
     def set_timer_interval(self, interval):
         self.timer.setInterval(interval)
-
-class CrosshairDrawDialog(QtWidgets.QDialog):
-    def __init__(self, parent=None):
+        self.update_follow_timer()
+
+    def update_follow_timer(self):
+        # Fixed mode and event-driven follow mode need no timer at all
+        self.following = any(window.settings["follow_mouse"] for window in self.windows())
+        polling = self.following and not self.settings["follow_events"]
+        if polling and not self.timer.isActive():
+            self.timer.start()
+        elif not polling and self.timer.isActive():
+            self.timer.stop()
+
+class DrawCanvas(QtWidgets.QWidget):
+    # Editing surface of CrosshairDrawDialog. Grid and finished strokes are
+    # baked into one pixmap; each new mouse sample draws one segment onto it
+    # and repaints only that segment's rectangle, so fast mice stay cheap.
+    SIDE = 320  # Logical pixels
+
+    def __init__(self, drawing, color, parent=None):
         super().__init__(parent)
-        self.setWindowTitle("Draw your crosshair")
-        self.resize(200, 200)
-        self.canvas = QtGui.QPixmap(200, 200)
-        self.canvas.fill(QtCore.Qt.transparent)
-        self.label = QtWidgets.QLabel()
-        self.label.setPixmap(self.canvas)
-        layout = QtWidgets.QVBoxLayout(self)
-        layout.addWidget(self.label)
-        self.last_point = None
+        self.setFixedSize(self.SIDE, self.SIDE)
+        self.setAttribute(QtCore.Qt.WA_OpaquePaintEvent)
+        self.color = color
+        self.grid = drawing["grid"]
+        self.strokes = copy.deepcopy(drawing["strokes"])
+        self.stroke = None  # The stroke being drawn
+        self.pen_width = 1
+        self.mirror = "none"
+        self.snap = True
+        self.image = None
+        self.rebake()
+
+    def zoom(self):
+        return self.SIDE / self.grid
+
+    def set_grid(self, grid):
+        # Strokes keep their place and width relative to the canvas
+        scale = grid / self.grid
+        for stroke in self.strokes:
+            stroke["points"] = [value * scale for value in stroke["points"]]
+            stroke["width"] *= scale
+        self.grid = grid
+        self.rebake()
+
+    def rebake(self):
+        dpr = self.devicePixelRatioF()
+        self.image = QtGui.QPixmap(math.ceil(self.SIDE * dpr), math.ceil(self.SIDE * dpr))
+        self.image.setDevicePixelRatio(dpr)
+        self.image.fill(QtGui.QColor(40, 40, 40))
+        painter = QtGui.QPainter(self.image)
+        zoom = self.zoom()
+        if zoom >= 4:  # Pixel grid only where the lines are far enough apart
+            painter.setPen(QtGui.QColor(55, 55, 55))
+            for i in range(1, self.grid):
+                painter.drawLine(QtCore.QPointF(i * zoom, 0), QtCore.QPointF(i * zoom, self.SIDE))
+                painter.drawLine(QtCore.QPointF(0, i * zoom), QtCore.QPointF(self.SIDE, i * zoom))
+        painter.setPen(QtGui.QColor(90, 90, 90))
+        painter.drawLine(QtCore.QPointF(self.SIDE / 2, 0), QtCore.QPointF(self.SIDE / 2, self.SIDE))
+        painter.drawLine(QtCore.QPointF(0, self.SIDE / 2), QtCore.QPointF(self.SIDE, self.SIDE / 2))
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.scale(zoom, zoom)
+        paint_strokes(painter, self.strokes, self.grid, self.color)
+        painter.end()
+        self.update()
+
+    def grid_point(self, pos):
+        x, y = pos.x() / self.zoom(), pos.y() / self.zoom()
+        if self.snap:
+            # Pixel centers for odd widths, pixel corners for even ones, so lines stay crisp
+            half = 0.5 if round(self.pen_width) % 2 else 0.0
+            x, y = math.floor(x - half + 0.5) + half, math.floor(y - half + 0.5) + half
+        return min(self.grid, max(0.0, x)), min(self.grid, max(0.0, y))
+
+    def draw_segment(self, a, b):
+        zoom = self.zoom()
+        stroke = {"points": [*a, *b], "width": self.stroke["width"], "mirror": self.stroke["mirror"]}
+        painter = QtGui.QPainter(self.image)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.scale(zoom, zoom)
+        pen = stroke_pen(self.color, stroke["width"])
+        margin = stroke["width"] * zoom / 2 + 2
+        dirty = QtCore.QRectF()
+        for path in stroke_paths(stroke, self.grid):
+            painter.strokePath(path, pen)
+            rect = QtCore.QRectF(path.boundingRect().topLeft() * zoom, path.boundingRect().bottomRight() * zoom)
+            dirty = dirty.united(rect.adjusted(-margin, -margin, margin, margin))
+        painter.end()
+        self.update(dirty.toAlignedRect())
+
+    def undo(self):
+        if self.strokes:
+            self.strokes.pop()
+            self.rebake()
+
+    def clear(self):
+        self.strokes = []
+        self.rebake()
 
     def mousePressEvent(self, event):
-        self.last_point = event.pos()
+        if event.button() != QtCore.Qt.LeftButton:
+            return
+        point = self.grid_point(event.pos())
+        self.stroke = {"points": list(point), "width": self.pen_width, "mirror": self.mirror}
+        self.draw_segment(point, point)
 
     def mouseMoveEvent(self, event):
-        if self.last_point:
-            painter = QtGui.QPainter(self.canvas)
-            pen = QtGui.QPen(QtCore.Qt.red, 3)
-            painter.setPen(pen)
-            painter.drawLine(self.last_point, event.pos())
-            painter.end()
-            self.label.setPixmap(self.canvas)
-            self.last_point = event.pos()
+        if self.stroke is None:
+            return
+        point = self.grid_point(event.pos())
+        last = tuple(self.stroke["points"][-2:])
+        if point == last:
+            return  # Still on the same snapped point
+        self.stroke["points"].extend(point)
+        self.draw_segment(last, point)
 
     def mouseReleaseEvent(self, event):
-        self.last_point = None
+        if self.stroke is not None:
+            self.strokes.append(self.stroke)
+            self.stroke = None
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        rect = event.rect()
+        dpr = self.image.devicePixelRatio()
+        painter.drawPixmap(QtCore.QRectF(rect), self.image,
+                           QtCore.QRectF(rect.x() * dpr, rect.y() * dpr, rect.width() * dpr, rect.height() * dpr))
+        painter.end()
+
+class CrosshairDrawDialog(QtWidgets.QDialog):
+    # Stroke editor for the "drawn" shape. The result is settings, not a PNG:
+    # the crosshair renders it straight into the render cache.
+    def __init__(self, settings, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Draw your crosshair")
+        drawing = settings["drawing"]
+        if not drawing["strokes"]:
+            drawing = {**drawing, "grid": min(400, max(8, settings["size"]))}  # Start at the target size
+        self.canvas = DrawCanvas(drawing, QtGui.QColor(settings["color"]))
+
+        self.gridSpinBox = QtWidgets.QSpinBox()
+        self.gridSpinBox.setRange(8, 400)
+        self.gridSpinBox.setValue(drawing["grid"])
+        self.gridSpinBox.valueChanged.connect(self.canvas.set_grid)
+        self.widthSpinBox = QtWidgets.QSpinBox()
+        self.widthSpinBox.setRange(1, 20)
+        self.widthSpinBox.valueChanged.connect(self.set_width)
+        self.mirrorCombo = QtWidgets.QComboBox()
+        for text, mode in zip(("None", "Left/right", "Top/bottom", "Four-way"), MIRROR_MODES):
+            self.mirrorCombo.addItem(text, mode)
+        self.mirrorCombo.currentIndexChanged.connect(self.set_mirror)
+        self.snapCheck = QtWidgets.QCheckBox("Snap to pixels")
+        self.snapCheck.setChecked(True)
+        self.snapCheck.stateChanged.connect(self.set_snap)
+        self.undoBtn = QtWidgets.QPushButton("Undo")
+        self.undoBtn.clicked.connect(self.canvas.undo)
+        self.clearBtn = QtWidgets.QPushButton("Clear")
+        self.clearBtn.clicked.connect(self.canvas.clear)
+        QtWidgets.QShortcut(QtGui.QKeySequence.Undo, self, self.canvas.undo)
+
+        tools = QtWidgets.QFormLayout()
+        tools.addRow("Grid (px):", self.gridSpinBox)
+        tools.addRow("Pen width (px):", self.widthSpinBox)
+        tools.addRow("Mirror:", self.mirrorCombo)
+        tools.addRow(self.snapCheck)
+        editLayout = QtWidgets.QHBoxLayout()
+        editLayout.addWidget(self.undoBtn)
+        editLayout.addWidget(self.clearBtn)
+        tools.addRow(editLayout)
+        btns = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Save | QtWidgets.QDialogButtonBox.Cancel)
+        btns.accepted.connect(self.accept)
+        btns.rejected.connect(self.reject)
+        layout = QtWidgets.QHBoxLayout(self)
+        layout.addWidget(self.canvas)
+        side = QtWidgets.QVBoxLayout()
+        side.addLayout(tools)
+        side.addStretch()
+        side.addWidget(btns)
+        layout.addLayout(side)
+
+    def set_width(self, width):
+        self.canvas.pen_width = width
+
+    def set_mirror(self, index):
+        self.canvas.mirror = self.mirrorCombo.itemData(index)
+
+    def set_snap(self, state):
+        self.canvas.snap = bool(state)
+
+    def get_drawing(self):
+        return {"grid": self.canvas.grid, "strokes": copy.deepcopy(self.canvas.strokes)}
 
 class OffsetAdjustDialog(QtWidgets.QDialog):
     def __init__(self, x, y, follow_mouse, crosshair, parent=None):
@@ -629,16 +3018,8 @@ class OffsetAdjustDialog(QtWidgets.QDialog):
             super().keyPressEvent(event)
             return
         self.update_label()
-        # Live update crosshair position
-        if self.follow_mouse:
-            self.crosshair.settings["x"] = self.x
-            self.crosshair.settings["y"] = self.y
-            self.crosshair.follow_mouse()
-        else:
-            self.crosshair.settings["x"] = self.x
-            self.crosshair.settings["y"] = self.y
-            self.crosshair.load_crosshair()
-            self.crosshair.update()
+        # Live update crosshair position, saved when the dialog is accepted
+        self.crosshair.apply_settings({"x": self.x, "y": self.y}, persist=False)
 
     def update_label(self):
         self.offset_label.setText(f"X: {self.x:.2f}  Y: {self.y:.2f}")
@@ -646,10 +3027,71 @@ class OffsetAdjustDialog(QtWidgets.QDialog):
     def get_offsets(self):
         return self.x, self.y
 
+class TelemetryDialog(QtWidgets.QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Stats")
+        layout = QtWidgets.QVBoxLayout(self)
+        # Summary columns, then one histogram column per Telemetry.BUCKETS bucket
+        buckets = [f"<={edge:g}" for edge in Telemetry.BUCKETS] + [f">{Telemetry.BUCKETS[-1]:g}"]
+        self.table = QtWidgets.QTableWidget(len(Telemetry.METRICS), 6 + len(buckets))
+        self.table.setHorizontalHeaderLabels(["Samples", "Mean ms", "p50 ms", "p95 ms", "p99 ms", "Max ms"] + buckets)
+        self.table.setVerticalHeaderLabels(list(Telemetry.METRICS.values()))
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.table)
+        btns = QtWidgets.QHBoxLayout()
+        for text, slot in (("Refresh", self.refresh), ("Clear", self.clear),
+                           ("Export JSON", self.export_json), ("Export CSV", self.export_csv)):
+            btn = QtWidgets.QPushButton(text)
+            btn.clicked.connect(slot)
+            btns.addWidget(btn)
+        layout.addLayout(btns)
+        self.resize(1100, 260)
+        self.refresh()
+
+    def refresh(self):
+        summary = telemetry.summary()
+        for row, name in enumerate(Telemetry.METRICS):
+            stats = summary[name]
+            values = [str(stats["count"])]
+            if stats["count"]:
+                values += [f"{stats[key]:.3f}" for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")]
+                values += [str(count) for count in stats["histogram"]]
+            else:
+                values += ["-"] * (5 + len(Telemetry.BUCKETS) + 1)
+            for col, value in enumerate(values):
+                self.table.setItem(row, col, QtWidgets.QTableWidgetItem(value))
+
+    def clear(self):
+        telemetry.clear()
+        self.refresh()
+
+    def export_json(self):
+        fname, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export stats", "crosshairZ_stats.json", "JSON Files (*.json)")
+        if fname:
+            telemetry.export_json(fname)
+
+    def export_csv(self):
+        fname, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export stats", "crosshairZ_stats.csv", "CSV Files (*.csv)")
+        if fname:
+            telemetry.export_csv(fname)
+
 if __name__ == "__main__":
+    if getattr(sys, "frozen", False):
+        import multiprocessing
+        multiprocessing.freeze_support()  # Render pool workers of the .exe start here
+    startup_profile.enabled = "--profile-startup" in sys.argv[1:]
+    startup_profile.mark("imports")
+    if sys.argv[1:2] == ["render"]:
+        sys.exit(render_main(sys.argv[2:]))
+    if sys.argv[1:2] == ["ctl"]:
+        sys.exit(control_main(sys.argv[2:]))
     app = QtWidgets.QApplication(sys.argv)
     app.setWindowIcon(QtGui.QIcon("crosshair.ico"))
+    app.aboutToQuit.connect(json_store.flush)
+    startup_profile.mark("application")
     w = Crosshair()
+    app.aboutToQuit.connect(w.save_last_render)
     w.show()
 
     sys.exit(app.exec_())
@@ -0,0 +1,259 @@
+# Copyright © 2025 zinarr1
+#
+# Headless follow-mode tracking replay. Cursor traces, synthetic or recorded,
+# are played through Crosshair.follow_all in virtual time and the overlay is
+# compared with the cursor every millisecond.
+#
+#   python replay.py                                  synthetic traces, default settings
+#   python replay.py --intervals events,1,10 --predict 0,8
+#   python replay.py --trace mouse.csv                also replay a recorded trace
+#   python replay.py --out tracking.json              also write the results as JSON
+#
+# A recorded trace is a CSV of t_ms,x,y rows (a header row is skipped), one
+# row per cursor sample. "events" in --intervals follows every cursor change
+# like follow_events does; numbers poll at that timer_interval.
+
+import os
+import sys
+import csv
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import crosshairZ
+import bench
+from PyQt5 import QtWidgets, QtCore
+
+EVAL_STEP_MS = 2
+LAG_RANGE_MS = (-50, 200)  # Lag searched per sample, negative means leading
+
+
+def flick_trace():
+    # 100 ms smoothstep flick over 600 px, then still
+    positions = []
+    for t in range(600):
+        f = min(1.0, max(0.0, (t - 100) / 100))
+        positions.append((100 + 600 * (3 * f * f - 2 * f ** 3), 300))
+    return positions
+
+
+def circle_trace():
+    # Two turns per second on a 200 px radius
+    return [(400 + 200 * math.cos(4 * math.pi * t / 1000), 300 + 200 * math.sin(4 * math.pi * t / 1000))
+            for t in range(1000)]
+
+
+def sweep_trace():
+    # 1500 px/s across the screen, then still
+    return [(100 + 1.5 * min(t, 400), 300) for t in range(600)]
+
+
+def jitter_trace(seed=1):
+    # Small random steps around one spot, like holding the aim
+    rng = random.Random(seed)
+    x, y, positions = 400.0, 300.0, []
+    for _ in range(1000):
+        x = min(420.0, max(380.0, x + rng.uniform(-3, 3)))
+        y = min(320.0, max(280.0, y + rng.uniform(-3, 3)))
+        positions.append((x, y))
+    return positions
+
+
+SYNTHETIC_TRACES = {
+    "flick": flick_trace,
+    "circle": circle_trace,
+    "sweep": sweep_trace,
+    "jitter": jitter_trace,
+}
+
+
+def load_trace(path):
+    # Recorded samples held until the next one, one position per millisecond
+    samples = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            try:
+                samples.append(tuple(float(value) for value in row[:3]))
+            except ValueError:
+                continue  # Header
+    if not samples:
+        raise ValueError(f"no t_ms,x,y rows in {path}")
+    samples.sort()
+    start = samples[0][0]
+    positions, i = [], 0
+    for t in range(int(samples[-1][0] - start) + 1):
+        while i + 1 < len(samples) and samples[i + 1][0] - start <= t:
+            i += 1
+        positions.append(samples[i][1:])
+    return positions
+
+
+class TraceCursor:
+    # Stands in for QCursor.pos and the follow loop clock during a replay
+    def __init__(self, positions):
+        self.positions = positions
+        self.now_ms = 0
+
+    def pos(self):
+        x, y = self.positions[self.now_ms]
+        return QtCore.QPoint(round(x), round(y))
+
+    def clock(self):
+        return self.now_ms / 1000
+
+
+def replay(w, positions, interval, predict_ms, latency_ms):
+    # interval None follows cursor changes, otherwise polls every interval ms
+    w.apply_settings({
+        "follow_mouse": True,
+        "follow_events": interval is None,
+        "timer_interval": interval or w.settings["timer_interval"],
+        "predict_ms": predict_ms,
+    }, persist=False)
+    w.predictor.reset()
+    cursor = TraceCursor(positions)
+    w.cursor_pos, w.clock = cursor.pos, cursor.clock
+    half_w, half_h = w.content_size.width() / 2, w.content_size.height() / 2
+    shown = []  # Overlay center after the follow pass of each millisecond
+    follows = moves = 0
+    follow_time = 0.0
+    snap_at = None
+    followed = None  # Cursor position of the last follow pass
+    try:
+        for t in range(len(positions)):
+            cursor.now_ms = t
+            if interval is None:
+                due = cursor.pos() != followed
+            else:
+                due = t % interval == 0
+            if snap_at is not None and t >= snap_at:
+                due, snap_at = True, None
+            if due:
+                before = w.pos()
+                followed = cursor.pos()
+                started = time.perf_counter()
+                w.follow_all()
+                follow_time += time.perf_counter() - started
+                follows += 1
+                moves += w.pos() != before
+                if w.snap_timer.isActive():
+                    # The snap-back timer runs in trace time as well
+                    snap_at = t + w.snap_timer.interval()
+                    w.snap_timer.stop()
+            shown.append((w.x() + half_w, w.y() + half_h))
+    finally:
+        del w.cursor_pos, w.clock
+
+    errors, lags = [], []
+    for t in range(latency_ms, len(positions), EVAL_STEP_MS):
+        ox, oy = shown[t - latency_ms]  # On screen latency_ms after the move
+        x, y = positions[t]
+        errors.append(math.hypot(ox - x, oy - y))
+        if t and positions[t] != positions[t - 1]:
+            lags.append(estimate_lag(positions, t, ox, oy))
+    errors.sort()
+    lags.sort()
+    return {
+        "follows": follows,
+        "moves": moves,
+        "follow_ms": follow_time * 1000,
+        "lag_p50_ms": crosshairZ.percentile(lags, 0.5),
+        "lag_p95_ms": crosshairZ.percentile(lags, 0.95),
+        "error_p50_px": crosshairZ.percentile(errors, 0.5),
+        "error_p95_px": crosshairZ.percentile(errors, 0.95),
+        "error_max_px": max(errors, default=0.0),
+    }
+
+
+def estimate_lag(positions, t, x, y):
+    # How long ago the cursor was closest to (x, y), preferring the smallest lag
+    best, best_lag = None, 0
+    low, high = LAG_RANGE_MS
+    for lag in sorted(range(low, high + 1), key=abs):
+        i = t - lag
+        if 0 <= i < len(positions):
+            distance = math.hypot(positions[i][0] - x, positions[i][1] - y)
+            if best is None or distance < best:
+                best, best_lag = distance, lag
+    return best_lag
+
+
+def parse_intervals(text):
+    return [None if item == "events" else int(item) for item in text.split(",")]
+
+
+def run(traces, intervals, predicts, latency_ms):
+    bench.stub_platform()
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            w = crosshairZ.Crosshair()
+            w.show()
+            w.wait_for_render()
+            for name, positions in traces.items():
+                for interval in intervals:
+                    mode = "events" if interval is None else f"poll{interval}ms"
+                    for predict_ms in predicts:
+                        results[f"{name}/{mode}/predict{predict_ms}ms"] = replay(
+                            w, positions, interval, predict_ms, latency_ms)
+            crosshairZ.json_store.flush()
+            crosshairZ.profile_store.close()
+        finally:
+            os.chdir(cwd)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "qt": QtCore.QT_VERSION_STR,
+            "display_latency_ms": latency_ms,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def print_results(report):
+    width = max(len(name) for name in report["results"])
+    print(f"{'':<{width}}  follows  moves  cost ms  lag p50/p95 ms  error p50/p95/max px")
+    for name, r in report["results"].items():
+        print(f"{name:<{width}}  {r['follows']:>7}  {r['moves']:>5}  {r['follow_ms']:>7.2f}"
+              f"  {r['lag_p50_ms']:>6} /{r['lag_p95_ms']:>5}"
+              f"  {r['error_p50_px']:>6.1f} /{r['error_p95_px']:>6.1f} /{r['error_max_px']:>6.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay cursor traces through the crosshairZ follow loop")
+    parser.add_argument("--trace", action="append", default=[], help="recorded t_ms,x,y CSV, may repeat")
+    parser.add_argument("--synthetic", default=",".join(SYNTHETIC_TRACES),
+                        help="synthetic traces to run, empty for none")
+    parser.add_argument("--intervals", default="events,1,5,10,16", help="'events' and/or poll intervals in ms")
+    parser.add_argument("--predict", default="0,8", help="predict_ms values to compare")
+    parser.add_argument("--display-latency-ms", type=int, default=8,
+                        help="time from window move to the move being on screen")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    traces = {name: SYNTHETIC_TRACES[name]() for name in filter(None, args.synthetic.split(","))}
+    for path in args.trace:
+        traces[os.path.splitext(os.path.basename(path))[0]] = load_trace(path)
+    predicts = [int(value) for value in args.predict.split(",")]
+    report = run(traces, parse_intervals(args.intervals), predicts, args.display_latency_ms)
+    print_results(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())